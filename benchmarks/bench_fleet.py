@@ -0,0 +1,38 @@
+"""
+FleetPlanner scaling benchmark: planning time of a fleet by number of processes.
+
+Usage: python -m benchmarks.bench_fleet [nb_robots] [nb_positions]
+"""
+import os
+import sys
+import time
+
+from benchmarks.routes import random_walk
+from ex02.fleet import FleetPlanner
+from ex02.robot import Arranger
+
+
+def measure(nb_robots, size, processes):
+    jobs = [(robot_id, random_walk(size, seed=robot_id), Arranger()) for robot_id in range(nb_robots)]
+    with FleetPlanner(processes=processes) as planner:
+        # starts workers
+        planner.plan(jobs[:2])
+        start = time.perf_counter()
+        planner.plan(jobs)
+        return time.perf_counter() - start
+
+
+def main(argv):
+    nb_robots = int(argv[1]) if len(argv) > 1 else 64
+    size = int(argv[2]) if len(argv) > 2 else 5_000
+    serial = measure(nb_robots, size, 0)
+    print(f'serial: {serial:.2f} s')
+    processes = 1
+    while processes <= (os.cpu_count() or 1):
+        elapsed = measure(nb_robots, size, processes)
+        print(f'{processes} processes: {elapsed:.2f} s, speedup x{serial / elapsed:.2f}')
+        processes *= 2
+
+
+if __name__ == '__main__':
+    main(sys.argv)
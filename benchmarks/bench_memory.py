@@ -0,0 +1,83 @@
+"""
+Memory benchmark: bytes retained per planned motion.
+
+The current slotted value types are compared with a reference layout
+rebuilding the same objects with a per-instance __dict__ (the layout used
+before Point, Translation, Rotation and Arc became slotted).
+
+Usage: python -m benchmarks.bench_memory [nb_positions]
+"""
+import sys
+import tracemalloc
+
+from benchmarks.routes import zig_zag
+from ex02.robot import Navigator, Arranger
+
+
+class _Record:
+    """Plain object with a __dict__, used as reference layout."""
+
+    def __init__(self, attributes):
+        for name, value in attributes:
+            setattr(self, name, value)
+
+
+def _as_records(motions):
+    """Rebuilds motions with the reference layout, keeping shared objects shared."""
+    memo = {}
+    # one record class per value type, so instances share their dict keys
+    classes = {}
+
+    def as_record(obj):
+        if not hasattr(obj, '__slots__'):
+            return obj
+        if id(obj) not in memo:
+            cls = classes.setdefault(type(obj), type(type(obj).__name__, (_Record,), {}))
+            # unset slots, e.g. the error of a valid arc, are left out
+            memo[id(obj)] = cls([(name, as_record(getattr(obj, name))) for name in obj.__slots__
+                                 if hasattr(obj, name)])
+        return memo[id(obj)]
+
+    return [as_record(m) for m in motions]
+
+
+def _evaluated(motions):
+    """Computes lazy arc values, so that both layouts hold the same values."""
+    for motion in motions:
+        arc = getattr(motion, 'arc', None)
+        if arc is not None:
+            arc.validate()
+    return motions
+
+
+def _traced(fn):
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    result = fn()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, after - before, peak - before
+
+
+def measure_bytes_per_motion(size):
+    """
+    :param size: nb of positions of the route
+    :return: (nb of motions, bytes per motion as slotted types, bytes per motion as dict layout)
+    """
+    positions = zig_zag(size)
+    navigator = Navigator(arranger=Arranger())
+    motions, retained, _ = _traced(lambda: _evaluated(navigator.compute_motions(positions)))
+    records, reference, _ = _traced(lambda: _as_records(motions))
+    return len(motions), retained / len(motions), reference / len(records)
+
+
+def main(argv):
+    size = int(argv[1]) if len(argv) > 1 else 100_000
+    nb_motions, slotted, reference = measure_bytes_per_motion(size)
+    print(f'motions={nb_motions}')
+    print(f'__dict__ layout: {reference:.1f} B/motion')
+    print(f'__slots__ layout: {slotted:.1f} B/motion')
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,44 @@
+"""
+Telecom wire format benchmark: encode/decode throughput of LOADING telecoms,
+compared with pickling the same telecom with a list of tuples as payload.
+
+Usage: python -m benchmarks.bench_telecom [nb_positions] [repeat]
+"""
+import pickle
+import sys
+import timeit
+
+from benchmarks.routes import random_walk
+from ex02.geometry import PointArray
+from ex02.telecom import Telecom, Command
+
+
+def measure(size, repeat):
+    """
+    :return: dict of waypoints per second by operation
+    """
+    positions = random_walk(size)
+    tc = Telecom(command=Command.LOADING, payload=positions)
+    tc_array = Telecom(command=Command.LOADING, payload=PointArray.new(positions))
+    encoded = tc.encode()
+    pickled = pickle.dumps(tc)
+
+    operations = {
+        'encode_tuples': lambda: tc.encode(),
+        'encode_point_array': lambda: tc_array.encode(),
+        'decode': lambda: Telecom.decode(encoded),
+        'pickle_dumps': lambda: pickle.dumps(tc),
+        'pickle_loads': lambda: pickle.loads(pickled),
+    }
+    return {name: size * repeat / timeit.timeit(fn, number=repeat) for name, fn in operations.items()}
+
+
+def main(argv):
+    size = int(argv[1]) if len(argv) > 1 else 100_000
+    repeat = int(argv[2]) if len(argv) > 2 else 20
+    for name, throughput in measure(size, repeat).items():
+        print(f'{name}: {throughput:,.0f} waypoints/s')
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,47 @@
+"""
+Generated route fixtures for benchmarks.
+"""
+import math
+import random
+
+DEFAULT_SIZES = (10, 1_000, 100_000)
+ALL_SIZES = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+
+def straight_line(size):
+    return [(float(i), 0.) for i in range(size)]
+
+
+def zig_zag(size):
+    return [(float(i), float(i % 2)) for i in range(size)]
+
+
+def random_walk(size, seed=0):
+    rnd = random.Random(seed)
+    x = y = 0.
+    heading = 0.
+    positions = [(x, y)]
+    for _ in range(size - 1):
+        heading += rnd.uniform(-math.pi / 2, math.pi / 2)
+        step = rnd.uniform(1., 5.)
+        x += step * math.cos(heading)
+        y += step * math.sin(heading)
+        positions.append((x, y))
+    return positions
+
+
+def closed_loop(size):
+    """Regular polygon with size - 1 corners, ending on its first position."""
+    corners = max(size - 1, 3)
+    radius = corners / (2 * math.pi)
+    positions = [(radius * math.cos(2 * math.pi * i / corners), radius * math.sin(2 * math.pi * i / corners))
+                 for i in range(corners)]
+    return (positions + positions[:1])[:size]
+
+
+SHAPES = {
+    'straight_line': straight_line,
+    'zig_zag': zig_zag,
+    'random_walk': random_walk,
+    'closed_loop': closed_loop,
+}
@@ -0,0 +1,210 @@
+"""
+Benchmark suite: times and peak memory of geometry, arrangers, motion
+execution and telecom dispatch on generated routes.
+
+Results are written as JSON, and can be compared with a previous run:
+
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --sizes 10 1000 1000000 --baseline results.json
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from benchmarks.routes import SHAPES, DEFAULT_SIZES
+from ex02.geometry import Point, Line, Arc
+from ex02.robot import (Arranger, CurveArranger, Navigator, MotionController, Wheel, EnergySupplier,
+                        Transmitter, Robot)
+from ex02.telecom import Telecom, Command
+
+# motion execution runs every step: only the first motions of a route are moved
+MAX_MOVED_MOTIONS = 200
+
+
+def _points(positions):
+    return [Point.new(xy) for xy in positions]
+
+
+def bench_point_arithmetic(positions):
+    points = _points(positions)
+
+    def run():
+        origin = points[0]
+        for p in points:
+            ((p - origin) * 0.5 + origin).normal()
+    return run, len(points)
+
+
+def bench_line_intersection(positions):
+    points = _points(positions)
+    lines = [Line(p, q - p) for p, q in zip(points, points[1:]) if not p == q]
+
+    def run():
+        for l0, l1 in zip(lines, lines[1:]):
+            try:
+                l0.intersection(l1)
+            except ValueError:
+                pass
+    return run, max(len(lines) - 1, 0)
+
+
+def bench_arc_construction(positions):
+    translations = Navigator(Arranger()).to_translations(_points(positions))
+    corners = [(t0, t1) for t0, t1 in zip(translations, translations[1:]) if not t0.is_parallel_with(t1)]
+
+    def run():
+        for t0, t1 in corners:
+            Arc(t0.end, t1.start, t0.vector, t1.vector, validate=True)
+    return run, len(corners)
+
+
+def _bench_arranger(arranger):
+    def bench(positions):
+        translations = Navigator(arranger).to_translations(_points(positions))
+        return (lambda: arranger.arrange(translations)), len(translations)
+    return bench
+
+
+def bench_motion_controller_move(positions):
+    motions = Navigator(Arranger()).compute_motions(positions)[:MAX_MOVED_MOTIONS]
+    controller = MotionController(right_wheel=Wheel(), left_wheel=Wheel(), configuration={})
+
+    def run():
+        energy_supplier = EnergySupplier(quantity=float('inf'))
+        for motion in motions:
+            controller.move(motion, energy_supplier)
+    return run, len(motions)
+
+
+def bench_transmitter_exchange(positions):
+    tcs = [Telecom(command=Command.READY_FOR_LOADING), Telecom(command=Command.LOADING, payload=positions)]
+
+    def run():
+        # a new robot each time: its navigator would otherwise reuse the plan of the previous run
+        robot = Robot(transmitter=Transmitter(),
+                      motion_controller=MotionController(right_wheel=Wheel(), left_wheel=Wheel(), configuration={}),
+                      navigator=Navigator(Arranger()),
+                      energy_supplier=EnergySupplier(quantity=float('inf')))
+        for tc in tcs:
+            robot.exchange(tc)
+    return run, len(positions)
+
+
+BENCHMARKS = {
+    'point_arithmetic': bench_point_arithmetic,
+    'line_intersection': bench_line_intersection,
+    'arc_construction': bench_arc_construction,
+    'arranger': _bench_arranger(Arranger()),
+    'curve_arranger': _bench_arranger(CurveArranger()),
+    'motion_controller_move': bench_motion_controller_move,
+    'transmitter_exchange': bench_transmitter_exchange,
+}
+
+# (benchmark, shape) combinations the planner does not support, skipped by the suite
+UNSUPPORTED = {
+    # parallel corners: CurveArranger finds no crossing for a curve ('Lines are parallel')
+    ('curve_arranger', 'zig_zag'): 'CurveArranger does not arrange zig-zag routes',
+}
+
+
+def measure(bench, positions, repeat):
+    """
+    :return: result dict with best time, time per item and peak memory
+    """
+    items = None
+    try:
+        run, items = bench(positions)
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+        tracemalloc.start()
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    except Exception as e:
+        return {'items': items, 'error': f'{type(e).__name__}: {e}'}
+
+    best = min(times)
+    return {'items': items,
+            'seconds': best,
+            'seconds_per_item': best / items if items else None,
+            'peak_bytes': peak}
+
+
+def run_suite(sizes, shapes, names, repeat):
+    results = []
+    for shape in shapes:
+        for size in sizes:
+            positions = SHAPES[shape](size)
+            for name in names:
+                if (name, shape) in UNSUPPORTED:
+                    print(f"{name:<24}{shape:<15}{size:>9}  skipped: {UNSUPPORTED[(name, shape)]}")
+                    continue
+                result = measure(BENCHMARKS[name], positions, repeat)
+                result.update(benchmark=name, shape=shape, size=size)
+                results.append(result)
+                _print_result(result)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Finds results slower than baseline by more than threshold (ratio)
+    :return: list of (result, ratio)
+    """
+    previous = {(r['benchmark'], r['shape'], r['size']): r for r in baseline['results']}
+    regressions = []
+    for result in results:
+        old = previous.get((result['benchmark'], result['shape'], result['size']))
+        if old and old.get('seconds') and result.get('seconds'):
+            ratio = result['seconds'] / old['seconds']
+            if ratio > threshold:
+                regressions.append((result, ratio))
+    return regressions
+
+
+def _print_result(result):
+    if 'error' in result:
+        print(f"{result['benchmark']:<24}{result['shape']:<15}{result['size']:>9}  {result['error']}")
+    else:
+        print(f"{result['benchmark']:<24}{result['shape']:<15}{result['size']:>9}"
+              f"{result['seconds'] * 1e3:>12.3f} ms{result['peak_bytes'] / 1024:>12.1f} KiB")
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--shapes', nargs='+', choices=list(SHAPES), default=list(SHAPES))
+    parser.add_argument('--benchmarks', nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', default='bench_output.json')
+    parser.add_argument('--baseline', help='previous results to compare with')
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help='slowdown ratio reported as regression')
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.sizes, args.shapes, args.benchmarks, args.repeat)
+    report = {'date': datetime.now(timezone.utc).isoformat(),
+              'python': platform.python_version(),
+              'platform': platform.platform(),
+              'results': results}
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=1)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for result, ratio in regressions:
+            print(f"REGRESSION {result['benchmark']} {result['shape']} {result['size']}: x{ratio:.2f}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,167 @@
+"""
+Module for wheels handing their step lengths to motor drivers in bulk
+"""
+import threading
+from abc import ABC, abstractmethod
+from array import array
+
+from ex02.robot import Wheel
+from ex02.stats import Stats
+
+
+class WheelDriver(ABC):
+    """
+    Motor driver, receiving step lengths by batches.
+    A busy driver calls notify_ready once it can accept lengths again.
+    """
+
+    def __init__(self):
+        self._ready = threading.Event()
+
+    @abstractmethod
+    def write(self, lengths: memoryview) -> int:
+        """
+        :param lengths: float64 step lengths, only valid during the call
+        :return: nb of accepted lengths, from the first one; fewer than given when driver is busy
+        """
+        pass
+
+    def notify_ready(self):
+        self._ready.set()
+
+    def clear_ready(self):
+        self._ready.clear()
+
+    def wait_ready(self, timeout: float = None) -> bool:
+        """
+        Blocks until driver is notified ready, since last clear_ready
+        :param timeout: seconds, or None to wait forever
+        :return: False on timeout
+        """
+        return self._ready.wait(timeout)
+
+
+class MemoryDriver(WheelDriver):
+    """
+    In-process stand-in for a motor driver: keeps written step lengths.
+    It accepts up to max_batch lengths by write, when given.
+    """
+
+    def __init__(self, max_batch: int = None):
+        super().__init__()
+        self.max_batch = max_batch
+        self.lengths = array('d')
+        self.batches = 0
+
+    def write(self, lengths: memoryview) -> int:
+        accepted = len(lengths) if self.max_batch is None else min(len(lengths), self.max_batch)
+        self.lengths.frombytes(lengths[:accepted].cast('B'))
+        self.batches += 1
+        return accepted
+
+
+class BufferedWheel(Wheel):
+    """
+    Wheel writing step lengths into a preallocated ring buffer, flushed to its driver
+    once watermark lengths are buffered, and at the end of each motion.
+    A step arriving while buffer is full is an overrun: buffer is drained before going on,
+    waiting for a busy driver to be ready again.
+    Stats counts overruns and flushed lengths, and times flushes.
+    """
+    DEFAULT_CAPACITY = 4096
+    DEFAULT_TIMEOUT = 5.
+
+    def __init__(self, driver: WheelDriver, capacity: int = DEFAULT_CAPACITY, watermark: int = None,
+                 timeout: float = DEFAULT_TIMEOUT):
+        """
+        :param driver: driver receiving step lengths
+        :param capacity: nb of buffered lengths
+        :param watermark: nb of buffered lengths triggering a flush, 3/4 of capacity by default
+        :param timeout: seconds waited for a busy driver before giving up
+        """
+        if capacity <= 0:
+            raise ValueError(f"Capacity must be positive, not {capacity}")
+        if watermark is None:
+            watermark = max(1, capacity * 3 // 4)
+        if not 0 < watermark <= capacity:
+            raise ValueError(f"Watermark must be in ]0, {capacity}], not {watermark}")
+        self.driver = driver
+        self.capacity = capacity
+        self.watermark = watermark
+        self.timeout = timeout
+        self.stats = Stats()
+        self._buffer = array('d', bytes(8 * capacity))
+        self._view = memoryview(self._buffer)
+        # buffered lengths are _count lengths from _head, wrapping around
+        self._head = 0
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def run(self, length):
+        if self._count == self.capacity:
+            self.stats.incr('overruns')
+            self._drain()
+        self._buffer[(self._head + self._count) % self.capacity] = length
+        self._count += 1
+        if self._count >= self.watermark:
+            self.flush()
+
+    def run_profile(self, lengths):
+        """
+        Buffers a whole step profile, by slices
+        :param lengths: sequence of step lengths
+        :return:
+        """
+        if not isinstance(lengths, array) or lengths.typecode != 'd':
+            lengths = array('d', lengths)
+        capacity = self.capacity
+        done = 0
+        size = len(lengths)
+        while done < size:
+            if self._count == capacity:
+                self.stats.incr('overruns')
+                self._drain()
+            tail = (self._head + self._count) % capacity
+            n = min(size - done, capacity - self._count, capacity - tail)
+            self._buffer[tail:tail + n] = lengths[done:done + n]
+            self._count += n
+            done += n
+            if self._count >= self.watermark:
+                self.flush()
+
+    def end_motion(self):
+        self._drain()
+
+    def flush(self) -> int:
+        """
+        Writes buffered lengths to driver, until it is empty or driver is busy
+        :return: nb of written lengths
+        """
+        stats = self.stats
+        start = stats.clock()
+        capacity = self.capacity
+        written = 0
+        while self._count:
+            head = self._head
+            end = min(head + self._count, capacity)
+            accepted = self.driver.write(self._view[head:end])
+            self._head = (head + accepted) % capacity
+            self._count -= accepted
+            written += accepted
+            if accepted < end - head:
+                break
+        stats.add_time('flush', stats.clock() - start)
+        stats.incr('flushed', written)
+        return written
+
+    def _drain(self):
+        driver = self.driver
+        while self._count:
+            # cleared before writing, so a notification during the write is not missed
+            driver.clear_ready()
+            if self.flush():
+                continue
+            if not driver.wait_ready(self.timeout):
+                raise BufferError(f'Driver does not accept step lengths after {self.timeout}s')
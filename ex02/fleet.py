@@ -0,0 +1,102 @@
+"""
+Module for planning routes of many robots in parallel
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Tuple
+
+from ex02.motion import pack_motions, unpack_motions
+from ex02.robot import Navigator, Arranger
+
+
+class PackedPlan:
+    """
+    Motions planned for a robot, packed by pack_motions, or the planning error.
+    """
+    __slots__ = ('robot_id', 'data', 'error')
+
+    def __init__(self, robot_id, data: bytes = None, error: str = None):
+        self.robot_id = robot_id
+        self.data = data
+        self.error = error
+
+    def is_valid(self) -> bool:
+        return self.error is None
+
+    def motions(self) -> List:
+        if self.error is not None:
+            raise ValueError(self.error)
+        return unpack_motions(self.data)
+
+    def __reduce__(self):
+        return PackedPlan, (self.robot_id, self.data, self.error)
+
+    def __eq__(self, other):
+        if isinstance(other, PackedPlan):
+            return (self.robot_id, self.data, self.error) == (other.robot_id, other.data, other.error)
+        return NotImplemented
+
+    def __repr__(self):
+        return f'plan({self.robot_id}, {len(self.data or b"")} bytes, error={self.error})'
+
+
+def plan_job(job: Tuple) -> PackedPlan:
+    """
+    Plans a (robot id, positions, arranger) job
+    :return: PackedPlan
+    """
+    robot_id, positions, arranger = job
+    try:
+        motions = Navigator(arranger=arranger).compute_motions(positions)
+        return PackedPlan(robot_id, data=pack_motions(motions))
+    except Exception as e:
+        return PackedPlan(robot_id, error=f'{type(e).__name__}: {e}')
+
+
+class FleetPlanner:
+    """
+    Plans (robot id, positions, arranger) jobs over a process pool.
+    With processes=0, jobs are planned serially in the calling process, with identical output.
+    """
+    CHUNKS_PER_PROCESS = 4
+
+    def __init__(self, processes: int = None, chunksize: int = None):
+        self.processes = processes
+        self.chunksize = chunksize
+        self._executor = None
+
+    def plan(self, jobs: Iterable[Tuple]) -> List[PackedPlan]:
+        """
+        :param jobs: (robot id, positions, arranger) tuples; arranger may be None for Arranger()
+        :return: plans, in the order of jobs
+        """
+        jobs = [(robot_id, positions, arranger if arranger is not None else Arranger())
+                for robot_id, positions, arranger in jobs]
+        if self.processes == 0 or len(jobs) < 2:
+            return [plan_job(job) for job in jobs]
+
+        executor = self._get_executor()
+        return list(executor.map(plan_job, jobs, chunksize=self._get_chunksize(len(jobs))))
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.processes)
+        return self._executor
+
+    def _get_chunksize(self, nb_jobs: int) -> int:
+        if self.chunksize:
+            return self.chunksize
+        # ProcessPoolExecutor runs os.cpu_count() processes by default
+        processes = self.processes or os.cpu_count() or 1
+        return max(1, nb_jobs // (processes * FleetPlanner.CHUNKS_PER_PROCESS))
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
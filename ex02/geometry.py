@@ -1,15 +1,48 @@
 import math
-from math import cos, sin, acos, asin, sqrt, isclose, fabs, pi
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Iterable, Iterator, List
+from math import cos, sin, acos, asin, atan2, sqrt, isclose, fabs, pi
 
 """"
 Module for simple geometry in 2D
 """
 
 
-class Point:
+class Immutable:
+    """
+    Base for compact value types: attributes are stored in __slots__ and
+    can only be set once, from __init__, through _set.
+    """
+    __slots__ = ()
+
+    def _set(self, name, value):
+        object.__setattr__(self, name, value)
+
+    @classmethod
+    def _restore(cls, *values):
+        """
+        Builds instance from its slot values, in __slots__ order, without running __init__
+        """
+        instance = object.__new__(cls)
+        for name, value in zip(cls.__slots__, values):
+            object.__setattr__(instance, name, value)
+        return instance
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+
+class Point(Immutable):
+    __slots__ = ('x', 'y')
+
     def __init__(self, x, y=None):
-        self.x = float(x)
-        self.y = float(y)
+        self._set('x', float(x))
+        self._set('y', float(y))
 
     @classmethod
     def new(cls, xy):
@@ -66,6 +99,14 @@ class Point:
             r = isclose(self.x, other.x, abs_tol=1e-9) and isclose(self.y, other.y, abs_tol=1e-9)
         return r
 
+    def __hash__(self):
+        # rounded to the equality tolerance: close points straddling a rounding boundary
+        # compare equal but may hash apart, hash keys must be built from the same inputs
+        return hash((round(self.x, 9) + 0., round(self.y, 9) + 0.))
+
+    def __reduce__(self):
+        return Point, (self.x, self.y)
+
     def __repr__(self):
         return f'p({self.x}, {self.y})'
 
@@ -78,11 +119,204 @@ class Point:
         return sqrt(dx * dx + dy * dy)
 
 
+class PointArray:
+    """
+    Batch of points stored as contiguous float64 coordinates (x0, y0, x1, y1, ...).
+    Operations are applied element-wise and follow Point semantics.
+    """
+
+    def __init__(self, coordinates=None):
+        if isinstance(coordinates, array) and coordinates.typecode == 'd':
+            self.coordinates = coordinates
+        elif isinstance(coordinates, memoryview) and coordinates.format == 'd':
+            # read-only view on foreign memory, kept without copy
+            self.coordinates = coordinates
+        else:
+            self.coordinates = array('d', coordinates if coordinates is not None else ())
+        if len(self.coordinates) % 2:
+            raise ValueError('Coordinates must be given by (x, y) pairs')
+
+    @classmethod
+    def new(cls, positions):
+        """
+        Builds array from an iterable of (x, y) positions
+        :param positions: iterable of pairs, tuples or Points
+        :return: PointArray
+        """
+        coordinates = array('d')
+        for xy in positions:
+            if isinstance(xy, Point):
+                coordinates.append(xy.x)
+                coordinates.append(xy.y)
+            else:
+                coordinates.append(float(xy[0]))
+                coordinates.append(float(xy[1]))
+        return cls(coordinates)
+
+    @classmethod
+    def from_points(cls, points):
+        return cls.new(points)
+
+    def to_points(self):
+        it = iter(self.coordinates)
+        return [Point(x, y) for x, y in zip(it, it)]
+
+    def iter_points(self):
+        it = iter(self.coordinates)
+        for x, y in zip(it, it):
+            yield Point(x, y)
+
+    @property
+    def xs(self):
+        return self.coordinates[0::2]
+
+    @property
+    def ys(self):
+        return self.coordinates[1::2]
+
+    def _pairs(self):
+        it = iter(self.coordinates)
+        return zip(it, it)
+
+    def _apply(self, other, fn):
+        if isinstance(other, PointArray):
+            if len(other) != len(self):
+                raise ValueError('Arrays have different lengths')
+            coordinates = array('d', (fn(a, b) for a, b in zip(self.coordinates, other.coordinates)))
+        else:
+            ox, oy = other.x, other.y
+            coordinates = array('d', (v for x, y in self._pairs() for v in (fn(x, ox), fn(y, oy))))
+        return PointArray(coordinates)
+
+    def normal(self):
+        return PointArray(array('d', (v for x, y in self._pairs() for v in (-y, x))))
+
+    def reverse(self):
+        return PointArray(array('d', (-v for v in self.coordinates)))
+
+    def normalize(self, d=0):
+        if d != 0:
+            return PointArray(array('d', (v / d for v in self.coordinates)))
+        coordinates = array('d')
+        for x, y in self._pairs():
+            norm = sqrt(x * x + y * y)
+            coordinates.append(x / norm)
+            coordinates.append(y / norm)
+        return PointArray(coordinates)
+
+    def scalar_product(self, other):
+        if isinstance(other, PointArray):
+            it = iter(other.coordinates)
+            return array('d', (x * ox + y * oy for (x, y), (ox, oy) in zip(self._pairs(), zip(it, it))))
+        return array('d', (x * other.x + y * other.y for x, y in self._pairs()))
+
+    def vectorial_product(self, other):
+        if isinstance(other, PointArray):
+            it = iter(other.coordinates)
+            return array('d', (x * oy - y * ox for (x, y), (ox, oy) in zip(self._pairs(), zip(it, it))))
+        return array('d', (x * other.y - y * other.x for x, y in self._pairs()))
+
+    @staticmethod
+    def distance(a: 'PointArray', b=None):
+        """
+        Element-wise distance between a and b (a Point, a PointArray or the origin).
+        :return: array of distances
+        """
+        if b is None:
+            return array('d', (sqrt(x * x + y * y) for x, y in a._pairs()))
+        return array('d', (sqrt(x * x + y * y) for x, y in (a - b)._pairs()))
+
+    def __add__(self, other):
+        if isinstance(other, (Point, PointArray)):
+            return self._apply(other, lambda u, v: u + v)
+        return NotImplemented
+
+    def __sub__(self, other):
+        if isinstance(other, (Point, PointArray)):
+            return self._apply(other, lambda u, v: u - v)
+        return NotImplemented
+
+    def __mul__(self, other):
+        if isinstance(other, float) or isinstance(other, int):
+            factor = float(other)
+            return PointArray(array('d', (v * factor for v in self.coordinates)))
+        return NotImplemented
+
+    def __len__(self):
+        return len(self.coordinates) // 2
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            start, stop, step = idx.indices(len(self))
+            if step != 1:
+                raise ValueError('Only contiguous slices are supported')
+            return PointArray(self.coordinates[2 * start:2 * stop])
+        if idx < 0:
+            idx += len(self)
+        return Point(self.coordinates[2 * idx], self.coordinates[2 * idx + 1])
+
+    def __iter__(self):
+        return self.iter_points()
+
+    def __reduce__(self):
+        return PointArray, (array('d', self.coordinates),)
+
+    def __eq__(self, other):
+        if isinstance(other, PointArray):
+            return len(self) == len(other) and all(isclose(a, b, abs_tol=1e-9)
+                                                  for a, b in zip(self.coordinates, other.coordinates))
+        return NotImplemented
+
+    def __repr__(self):
+        return f'points({len(self)})'
+
+
 class Segment:
     def __init__(self, start, end):
         self.start = start
         self.end = end
 
+    def length(self) -> float:
+        return Point.distance(self.start, self.end)
+
+    def bounding_box(self):
+        """
+        :return: (x min, y min, x max, y max)
+        """
+        a, b = self.start, self.end
+        return min(a.x, b.x), min(a.y, b.y), max(a.x, b.x), max(a.y, b.y)
+
+    def distance_to_point(self, point: Point) -> float:
+        a = self.start
+        u = self.end - a
+        square_length = u.scalar_product(u)
+        if square_length == 0:
+            return Point.distance(point, a)
+        coef = min(max((point - a).scalar_product(u) / square_length, 0.), 1.)
+        return Point.distance(point, a + u * coef)
+
+    def intersects(self, other: 'Segment') -> bool:
+        def side(a, b, c):
+            return (b - a).vectorial_product(c - a)
+
+        d0 = side(other.start, other.end, self.start)
+        d1 = side(other.start, other.end, self.end)
+        d2 = side(self.start, self.end, other.start)
+        d3 = side(self.start, self.end, other.end)
+        return ((d0 > 0 > d1) or (d0 < 0 < d1)) and ((d2 > 0 > d3) or (d2 < 0 < d3))
+
+    def distance(self, other: 'Segment') -> float:
+        """
+        Minimal distance between both segments, 0 if they cross.
+        """
+        if self.intersects(other):
+            return 0.
+        return min(self.distance_to_point(other.start), self.distance_to_point(other.end),
+                   other.distance_to_point(self.start), other.distance_to_point(self.end))
+
+    def __repr__(self):
+        return f'segment({self.start}, {self.end})'
+
 
 class Line:
     def __init__(self, point: Point, vector: Point):
@@ -120,34 +354,204 @@ class Line:
         return f'line({self.point}, {self.vector})'
 
 
-class Arc:
+class LRUCache:
+    """
+    Bounded mapping evicting least recently used entries, with hit/miss counters.
+    Thread safe: robots may plan in parallel, e.g. in executor threads.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        if maxsize <= 0:
+            raise ValueError('Cache size must be positive')
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        entries = self._entries
+        with self._lock:
+            value = entries.get(key, self)
+            if value is self:
+                self.misses += 1
+                return default
+            entries.move_to_end(key)
+            self.hits += 1
+        return value
+
+    def put(self, key, value):
+        entries = self._entries
+        with self._lock:
+            entries[key] = value
+            entries.move_to_end(key)
+            if len(entries) > self.maxsize:
+                entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return f'cache(size={len(self)}/{self.maxsize}, hits={self.hits}, misses={self.misses})'
+
+
+class Arc(Immutable):
     INDIRECT = "indirect"
     DIRECT = "direct"
-
-    def __init__(self, start: Point, end: Point, start_tangent: Point, end_tangent: Point = None):
-        self.start = start
-        self.end = end
+    DEFAULT_CACHE_SIZE = 4096
+    # inputs closer than the quantum share the same cached arc
+    CACHE_QUANTUM = 1e-9
+    # LRUCache used by Arc.new, None to disable
+    cache = None
+
+    __slots__ = ('start', 'end', 'start_tangent', 'end_tangent',
+                 'center', 'radius', 'angle', 'direction', 'length', '_error')
+    # slots computed on first access, see _compute
+    COMPUTED = frozenset(('center', 'radius', 'angle', 'direction', 'length'))
+    # errors of invalid arcs, kept in _error so that shared arcs are not computed again
+    ERRORS = (ValueError, AssertionError, ZeroDivisionError)
+
+    def __init__(self, start: Point, end: Point, start_tangent: Point, end_tangent: Point = None,
+                 validate: bool = False):
+        """
+        Center, radius, angle, direction and length are computed on first access.
+        :param validate: if True, they are computed at once, raising errors of invalid arcs
+        """
+        self._set('start', start)
+        self._set('end', end)
         if end_tangent is None:
             end_tangent = Geometry.get_symmetrical(start_tangent, (start - end))
 
-        self.start_tangent = start_tangent
-        self.end_tangent = end_tangent
+        self._set('start_tangent', start_tangent)
+        self._set('end_tangent', end_tangent)
+        if validate:
+            self._compute()
 
-        self.center = Arc.compute_center_from_both_tangents(start, end, start_tangent, end_tangent)
-        self.check_center_and_tangents_coherence()
+    def __getattr__(self, name):
+        # only called while a slot is not set
+        if name not in Arc.COMPUTED:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        # the error of an invalid arc is raised as is
+        self._compute()
+        return object.__getattribute__(self, name)
 
-        self.radius = Point.distance(self.center, self.start)
-        distance = Point.distance(start, end)
-        if distance:
-            self.angle = 2 * asin(distance / (2 * self.radius))
-        else:
-            self.angle = acos(start_tangent.scalar_product(end_tangent))
+    def _compute(self):
+        """
+        Computes derived values, and sets them all once arc is known to be valid.
+        The error of an invalid arc is kept, and raised again by later calls.
+        """
+        error = getattr(self, '_error', None)
+        if error is not None:
+            raise error.with_traceback(None)
+        start, end, start_tangent, end_tangent = self.start, self.end, self.start_tangent, self.end_tangent
 
-        self.direction = Arc.compute_direction(self)
-        if self.direction is Arc.INDIRECT:
-            self.angle = self.angle - 2*pi
-        self.length = math.fabs(self.angle * pi * self.radius)
+        try:
+            center = Arc.compute_center_from_both_tangents(start, end, start_tangent, end_tangent)
+            Arc._check_coherence(start, end, start_tangent, end_tangent, center)
+
+            radius = Point.distance(center, start)
+            distance = Point.distance(start, end)
+            if distance:
+                angle = 2 * asin(distance / (2 * radius))
+            else:
+                angle = acos(start_tangent.scalar_product(end_tangent))
+        except Arc.ERRORS as e:
+            self._set('_error', e)
+            raise
+
+        direction = Arc.INDIRECT if (center - start).vectorial_product(start_tangent) > 0 else Arc.DIRECT
+        if direction is Arc.INDIRECT:
+            angle = angle - 2*pi
+
+        self._set('center', center)
+        self._set('radius', radius)
+        self._set('angle', angle)
+        self._set('direction', direction)
+        self._set('length', math.fabs(angle * pi * radius))
+
+    def validate(self) -> 'Arc':
+        """
+        Computes derived values if needed
+        :return: self
+        :raise: ValueError, AssertionError or ZeroDivisionError for invalid arcs
+        """
+        try:
+            object.__getattribute__(self, 'length')
+        except AttributeError:
+            self._compute()
+        return self
+
+    def bounding_box(self):
+        """
+        Box of the swept arc: its ends, and the extreme points of its circle the arc passes by
+        :return: (x min, y min, x max, y max)
+        """
+        center, radius = self.center, self.radius
+        start_angle = atan2(self.start.y - center.y, self.start.x - center.x)
+        end_angle = atan2(self.end.y - center.y, self.end.x - center.x)
+        # direct arcs turn counterclockwise
+        sign = 1 if self.direction == Arc.DIRECT else -1
+        sweep = (sign * (end_angle - start_angle)) % (2 * pi)
+        xs, ys = [self.start.x, self.end.x], [self.start.y, self.end.y]
+        for k in range(4):
+            if (sign * (k * pi / 2 - start_angle)) % (2 * pi) <= sweep:
+                xs.append(center.x + radius * round(cos(k * pi / 2)))
+                ys.append(center.y + radius * round(sin(k * pi / 2)))
+        return min(xs), min(ys), max(xs), max(ys)
 
+    @classmethod
+    def new(cls, start: Point, end: Point, start_tangent: Point, end_tangent: Point = None,
+            validate: bool = False) -> 'Arc':
+        """
+        Builds arc, or returns the cached arc built from the same quantized inputs.
+        Invalid arcs are not cached when validated. Cached lazy arcs found invalid keep their error,
+        which is raised again by validation without computing them again.
+        """
+        cache = cls.cache
+        if cache is None:
+            return cls(start, end, start_tangent, end_tangent, validate)
+
+        q = 1. / cls.CACHE_QUANTUM
+        key = (round(start.x * q), round(start.y * q), round(end.x * q), round(end.y * q),
+               round(start_tangent.x * q), round(start_tangent.y * q),
+               None if end_tangent is None else (round(end_tangent.x * q), round(end_tangent.y * q)))
+        arc = cache.get(key)
+        if arc is None:
+            arc = cls(start, end, start_tangent, end_tangent, validate)
+            cache.put(key, arc)
+        elif validate:
+            arc.validate()
+        return arc
+
+    @classmethod
+    def configure_cache(cls, maxsize: int = DEFAULT_CACHE_SIZE) -> LRUCache:
+        """
+        Replaces arc cache
+        :param maxsize: max nb of cached arcs, 0 disables cache
+        :return: the new cache, or None
+        """
+        cls.cache = LRUCache(maxsize) if maxsize > 0 else None
+        return cls.cache
+
+    def _key(self):
+        return self.start, self.end, self.start_tangent, self.end_tangent
+
+    def __eq__(self, other):
+        if isinstance(other, Arc):
+            return self._key() == other._key()
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __reduce__(self):
+        return Arc, self._key()
 
     @staticmethod
     def compute_center_from_both_tangents(p0, p1, tangent_p0, tangent_p1):
@@ -199,8 +603,12 @@ class Arc:
         Tangents have to turn in the same direction from the center.
         :return:
         """
-        v_start = (self.start -self.center).vectorial_product(self.start_tangent)
-        v_end = (self.end -self.center).vectorial_product(self.end_tangent)
+        Arc._check_coherence(self.start, self.end, self.start_tangent, self.end_tangent, self.center)
+
+    @staticmethod
+    def _check_coherence(start, end, start_tangent, end_tangent, center):
+        v_start = (start - center).vectorial_product(start_tangent)
+        v_end = (end - center).vectorial_product(end_tangent)
         if not isclose(v_start, v_end):
             raise ValueError()
 
@@ -212,6 +620,100 @@ class Arc:
         return Arc.DIRECT
 
 
+class ArcBatch:
+    """
+    Arcs of many corners, computed in one pass over coordinate arrays.
+    Each arc gets the same values as Arc, and the first invalid corner raises the same error.
+    End tangents are required.
+    """
+    __slots__ = ('starts', 'ends', 'start_tangents', 'end_tangents',
+                 'centers', 'radii', 'angles', 'directions', 'lengths')
+
+    def __init__(self, starts: PointArray, ends: PointArray, start_tangents: PointArray, end_tangents: PointArray):
+        size = len(starts)
+        if not len(ends) == len(start_tangents) == len(end_tangents) == size:
+            raise ValueError('Arrays have different lengths')
+        self.starts = starts
+        self.ends = ends
+        self.start_tangents = start_tangents
+        self.end_tangents = end_tangents
+
+        centers = array('d', bytes(16 * size))
+        radii = array('d', bytes(8 * size))
+        angles = array('d', bytes(8 * size))
+        lengths = array('d', bytes(8 * size))
+        # 1 for indirect arcs
+        directions = bytearray(size)
+
+        for i, ((sx, sy), (ex, ey), (t0x, t0y), (t1x, t1y)) in enumerate(zip(
+                starts._pairs(), ends._pairs(), start_tangents._pairs(), end_tangents._pairs())):
+            # center: intersection of normal lines at start and end (Line.intersection)
+            d0 = sqrt(t0y * t0y + t0x * t0x)
+            v0x, v0y = -t0y / d0, t0x / d0
+            d1 = sqrt(t1y * t1y + t1x * t1x)
+            v1x, v1y = -t1y / d1, t1x / d1
+            v1_v0 = v1x * v0x + v1y * v0y
+            if isclose(fabs(v1_v0), 1.):
+                cx, cy = (ex + sx) / 2, (ey + sy) / 2
+            else:
+                dpx, dpy = ex - sx, ey - sy
+                dp_v1 = dpx * v1x + dpy * v1y
+                coef0 = (dpx * v0x + dpy * v0y - dp_v1 * v1_v0) / (1 - v1_v0 * v1_v0)
+                cx, cy = v0x * coef0 + sx, v0y * coef0 + sy
+            assert isclose(sqrt((sx - cx) * (sx - cx) + (sy - cy) * (sy - cy)),
+                           sqrt((ex - cx) * (ex - cx) + (ey - cy) * (ey - cy)))
+
+            # coherence of tangents
+            if not isclose((sx - cx) * t0y - (sy - cy) * t0x, (ex - cx) * t1y - (ey - cy) * t1x):
+                raise ValueError()
+
+            radius = sqrt((cx - sx) * (cx - sx) + (cy - sy) * (cy - sy))
+            distance = sqrt((sx - ex) * (sx - ex) + (sy - ey) * (sy - ey))
+            if distance:
+                angle = 2 * asin(distance / (2 * radius))
+            else:
+                angle = acos(t0x * t1x + t0y * t1y)
+            if (cx - sx) * t0y - (cy - sy) * t0x > 0:
+                directions[i] = 1
+                angle = angle - 2 * pi
+
+            centers[2 * i] = cx
+            centers[2 * i + 1] = cy
+            radii[i] = radius
+            angles[i] = angle
+            lengths[i] = fabs(angle * pi * radius)
+
+        self.centers = PointArray(centers)
+        self.radii = radii
+        self.angles = angles
+        self.directions = directions
+        self.lengths = lengths
+
+    @classmethod
+    def from_points(cls, starts: Iterable[Point], ends: Iterable[Point],
+                    start_tangents: Iterable[Point], end_tangents: Iterable[Point]) -> 'ArcBatch':
+        return cls(PointArray.new(starts), PointArray.new(ends),
+                   PointArray.new(start_tangents), PointArray.new(end_tangents))
+
+    def direction(self, idx: int) -> str:
+        return Arc.INDIRECT if self.directions[idx] else Arc.DIRECT
+
+    def arc(self, idx: int) -> Arc:
+        """
+        :param idx: corner index
+        :return: Arc of corner, built without computing it again
+        """
+        return Arc._restore(self.starts[idx], self.ends[idx], self.start_tangents[idx], self.end_tangents[idx],
+                            self.centers[idx], self.radii[idx], self.angles[idx], self.direction(idx),
+                            self.lengths[idx])
+
+    def arcs(self) -> List[Arc]:
+        return [self.arc(idx) for idx in range(len(self))]
+
+    def __len__(self):
+        return len(self.radii)
+
+
 
 class Geometry:
 
@@ -255,3 +757,77 @@ class Geometry:
     def is_beyond_point(candidate, point, vector):
         return (candidate - point).scalar_product(vector) > 0
 
+    @staticmethod
+    def simplify(points: List[Point], tolerance: float) -> List[Point]:
+        """
+        Ramer-Douglas-Peucker simplification: removes points closer than tolerance
+        to the segment joining kept points around them. Collinear runs become one segment.
+        :param points: point list
+        :param tolerance: max distance of a removed point to the simplified path
+        :return: simplified point list, keeping first and last points
+        """
+        size = len(points)
+        if size < 3:
+            return list(points)
+
+        kept = bytearray(size)
+        kept[0] = kept[-1] = 1
+        stack = [(0, size - 1)]
+        while stack:
+            first, last = stack.pop()
+            segment = Segment(points[first], points[last])
+            farthest, max_distance = 0, -1.
+            for idx in range(first + 1, last):
+                distance = segment.distance_to_point(points[idx])
+                if distance > max_distance:
+                    farthest, max_distance = idx, distance
+            if max_distance > tolerance:
+                kept[farthest] = 1
+                if farthest - first > 1:
+                    stack.append((first, farthest))
+                if last - farthest > 1:
+                    stack.append((farthest, last))
+        return [p for p, keep in zip(points, kept) if keep]
+
+    @staticmethod
+    def iter_simplify(points: Iterable[Point], tolerance: float) -> Iterator[Point]:
+        """
+        One pass simplification, for point streams (sleeve fitting): a run of points
+        is merged while a segment from its first point can pass within tolerance of all of them.
+        The angular sector of such segments is narrowed at each point of the run.
+        :param points: point iterable
+        :param tolerance: max distance of a removed point to the simplified path
+        :return: simplified point iterator, keeping first and last points
+        """
+        anchor = previous = reference = None
+        low = high = reach = 0.
+        for p in points:
+            if anchor is None:
+                anchor = p
+                yield p
+                continue
+            offset = p - anchor
+            distance = Point.distance(offset)
+            if reference is not None:
+                angle = atan2(reference.vectorial_product(offset), reference.scalar_product(offset))
+                if distance > tolerance and distance >= reach - tolerance and low <= angle <= high:
+                    half = asin(tolerance / distance)
+                    low, high = max(low, angle - half), min(high, angle + half)
+                    reach = max(reach, distance)
+                    previous = p
+                    continue
+                # previous point ends the run, and starts the next one
+                yield previous
+                anchor, reference = previous, None
+                offset = p - anchor
+                distance = Point.distance(offset)
+            if distance > tolerance:
+                reference = offset.normalize(distance)
+                half = asin(tolerance / distance)
+                low, high, reach = -half, half, distance
+            previous = p
+        if previous is not None and not (previous.x == anchor.x and previous.y == anchor.y):
+            yield previous
+
+
+Arc.configure_cache()
@@ -1,13 +1,17 @@
-from ex02.geometry import Point, Arc
+from array import array
+from typing import List
 
+from ex02.geometry import Point, Arc, Immutable
 
-class Translation:
+
+class Translation(Immutable):
+    __slots__ = ('start', 'end', 'length', 'vector')
 
     def __init__(self, start, end):
-        self.start = start
-        self.end = end
-        self.length = self._get_length()
-        self.vector = (end - start).normalize()
+        self._set('start', start)
+        self._set('end', end)
+        self._set('length', self._get_length())
+        self._set('vector', (end - start).normalize())
 
     def _get_length(self):
         return Point.distance(self.start, self.end)
@@ -18,14 +22,30 @@ class Translation:
     def is_parallel_with(self, other: 'Translation'):
         return self.vector.is_collinear(other.vector)
 
+    def __eq__(self, other):
+        if isinstance(other, Translation):
+            return self.start == other.start and self.end == other.end
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.start, self.end))
+
+    def __reduce__(self):
+        return Translation, (self.start, self.end)
+
     def __repr__(self):
         return f'start={self.start}, end={self.end}, len={self.length}, vector={self.vector}'
 
 
-class Rotation:
+class Rotation(Immutable):
+    __slots__ = ('arc',)
 
-    def __init__(self, start: Point, end: Point, start_vector: Point, end_vector: Point):
-        self.arc = Arc(start, end, start_vector, end_vector)
+    def __init__(self, start: Point, end: Point, start_vector: Point, end_vector: Point, validate: bool = False):
+        """
+        Arc values are computed on first access, see Arc.
+        :param validate: if True, arc is computed at once, raising its errors
+        """
+        self._set('arc', Arc.new(start, end, start_vector, end_vector, validate))
 
     def get_length(self):
         return self.arc.length
@@ -41,7 +61,70 @@ class Rotation:
     def new_from_translations(cls, previous_move, move):
         return Rotation(previous_move.end, move.start, previous_move.vector, move.vector)
 
+    def __eq__(self, other):
+        if isinstance(other, Rotation):
+            return self.arc == other.arc
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.arc)
+
+    def __reduce__(self):
+        arc = self.arc
+        return Rotation, (arc.start, arc.end, arc.start_tangent, arc.end_tangent)
+
     def __repr__(self):
         return f'start={self.arc.start}, end={self.arc.end}, radius={self.arc.radius}, ' \
                f'start_vector={self.arc.start_tangent},' \
-               f'end_vector={self.arc.end_tangent}'
\ No newline at end of file
+               f'end_vector={self.arc.end_tangent}'
+
+
+# packed motion: kind, then the 14 values below, unused values are 0
+_TRANSLATION, _ROTATION = 0., 1.
+_RECORD_SIZE = 15
+_DIRECTIONS = {Arc.DIRECT: 1., Arc.INDIRECT: -1.}
+
+
+def pack_motions(motions) -> bytes:
+    """
+    Packs motions as float64 records, with their computed values
+    (translation: start, end, length, vector;
+    rotation: start, end, tangents, center, radius, angle, length, direction)
+    :param motions: Translation and Rotation iterable
+    :return: bytes
+    """
+    values = array('d')
+    for motion in motions:
+        if isinstance(motion, Translation):
+            start, end, vector = motion.start, motion.end, motion.vector
+            values.extend((_TRANSLATION, start.x, start.y, end.x, end.y, motion.length, vector.x, vector.y,
+                           0., 0., 0., 0., 0., 0., 0.))
+        elif isinstance(motion, Rotation):
+            arc = motion.arc
+            values.extend((_ROTATION, arc.start.x, arc.start.y, arc.end.x, arc.end.y,
+                           arc.start_tangent.x, arc.start_tangent.y, arc.end_tangent.x, arc.end_tangent.y,
+                           arc.center.x, arc.center.y, arc.radius, arc.angle, arc.length,
+                           _DIRECTIONS[arc.direction]))
+        else:
+            raise ValueError(f"Motion {motion} can not be packed")
+    return values.tobytes()
+
+
+def unpack_motions(data) -> List:
+    """
+    Rebuilds motions packed by pack_motions, without computing them again
+    :param data: bytes-like object
+    :return: motion list
+    """
+    values = array('d')
+    values.frombytes(data)
+    motions = []
+    for idx in range(0, len(values), _RECORD_SIZE):
+        kind, sx, sy, ex, ey, a, b, c, d, e, f, g, h, i, j = values[idx:idx + _RECORD_SIZE]
+        if kind == _TRANSLATION:
+            motions.append(Translation._restore(Point(sx, sy), Point(ex, ey), a, Point(b, c)))
+        else:
+            arc = Arc._restore(Point(sx, sy), Point(ex, ey), Point(a, b), Point(c, d), Point(e, f),
+                               g, h, Arc.DIRECT if j > 0 else Arc.INDIRECT, i)
+            motions.append(Rotation._restore(arc))
+    return motions
@@ -0,0 +1,139 @@
+"""
+Module for the on-disk cache of motion plans, surviving restarts
+"""
+import hashlib
+import os
+import sys
+import tempfile
+from typing import List, Optional
+
+from ex02.geometry import PointArray
+from ex02.motion import pack_motions, unpack_motions
+
+
+class PlanCache:
+    """
+    Motion plans stored in a directory, one file by plan, packed by pack_motions.
+    Files are written atomically. Least recently used plans, by file mtime, are evicted above max_bytes.
+    """
+    SUFFIX = '.plan'
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, directory, max_bytes: int = DEFAULT_MAX_BYTES):
+        if max_bytes <= 0:
+            raise ValueError(f"Cache size must be positive, not {max_bytes}")
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def key(points, arranger, configuration: dict = None, tolerance: float = None) -> str:
+        """
+        Hash of what a plan depends on
+        :param points: route points, or a PointArray
+        :param arranger: Arranger, only its type matters
+        :param configuration: MotionController configuration, or None
+        :param tolerance: Navigator tolerance, or None
+        :return: hexadecimal sha256
+        """
+        coordinates = points.coordinates if isinstance(points, PointArray) else PointArray.new(points).coordinates
+        if sys.byteorder != 'little':
+            coordinates = coordinates[:]
+            coordinates.byteswap()
+        digest = hashlib.sha256()
+        arranger_type = type(arranger)
+        digest.update(f'{arranger_type.__module__}.{arranger_type.__qualname__}\n'.encode())
+        digest.update(repr(sorted((configuration or {}).items())).encode())
+        digest.update(f'\n{tolerance!r}\n'.encode())
+        digest.update(coordinates)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + PlanCache.SUFFIX)
+
+    def get(self, key: str) -> Optional[List]:
+        """
+        :param key: plan key
+        :return: cached motions, or None
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                motions = unpack_motions(f.read())
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError):
+            # unreadable plan, planned and written again
+            self._remove(path)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return motions
+
+    def put(self, key: str, motions: List):
+        """
+        Stores motions, then evicts least recently used plans above max_bytes.
+        Plans larger than max_bytes are not stored.
+        :param key: plan key
+        :param motions: Translation and Rotation list
+        :return:
+        """
+        data = pack_motions(motions)
+        if len(data) > self.max_bytes:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            self._remove(tmp_path)
+            raise
+        self._evict()
+
+    def _entries(self):
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.name.endswith(PlanCache.SUFFIX):
+                    try:
+                        stat = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return entries
+
+    def _evict(self):
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def clear(self):
+        for _, _, path in self._entries():
+            self._remove(path)
+
+    def __len__(self):
+        return len(self._entries())
+
+    def __contains__(self, key: str):
+        return os.path.exists(self._path(key))
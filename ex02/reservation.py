@@ -0,0 +1,164 @@
+"""
+Module for space-time reservation of robot plans, to detect conflicts between robots
+"""
+import math
+from typing import Dict, List, Tuple
+
+from ex02.geometry import Point, Segment
+from ex02.motion import Translation, Rotation
+
+
+class Footprint:
+    """
+    Area swept by a robot during a motion, between start and end times.
+    Translations also keep their segment, run at constant speed.
+    """
+    __slots__ = ('robot_id', 'index', 'start_time', 'end_time', 'box', 'segment')
+
+    def __init__(self, robot_id, index: int, start_time: float, end_time: float,
+                 box: Tuple[float, float, float, float], segment: Segment = None):
+        self.robot_id = robot_id
+        self.index = index
+        self.start_time = start_time
+        self.end_time = end_time
+        self.box = box
+        self.segment = segment
+
+    @classmethod
+    def new(cls, robot_id, index: int, motion, start_time: float, duration: float, clearance: float):
+        """
+        Builds footprint of a motion, inflated by clearance.
+        Rotations are bounded by their swept arc.
+        """
+        segment = None
+        if isinstance(motion, Translation):
+            segment = Segment(motion.start, motion.end)
+            x_min, y_min, x_max, y_max = segment.bounding_box()
+        elif isinstance(motion, Rotation):
+            x_min, y_min, x_max, y_max = motion.arc.bounding_box()
+        else:
+            raise ValueError(f"Motion {motion} can not be understood")
+        box = (x_min - clearance, y_min - clearance, x_max + clearance, y_max + clearance)
+        return cls(robot_id, index, start_time, start_time + duration, box, segment)
+
+    def overlaps(self, other: 'Footprint', clearance: float) -> bool:
+        if self.start_time >= other.end_time or other.start_time >= self.end_time:
+            return False
+        a, b = self.box, other.box
+        if a[0] > b[2] or b[0] > a[2] or a[1] > b[3] or b[1] > a[3]:
+            return False
+        if self.segment is not None and other.segment is not None:
+            return self.segment.distance(other.segment) < 2 * clearance \
+                   and self._closest_approach(other) < 2 * clearance
+        return True
+
+    def _position_at(self, time: float):
+        start, end = self.segment.start, self.segment.end
+        duration = self.end_time - self.start_time
+        coef = (time - self.start_time) / duration if duration else 1.
+        return start + (end - start) * coef
+
+    def _closest_approach(self, other: 'Footprint') -> float:
+        """
+        Minimal distance between both robots while they both run their translation
+        """
+        t0 = max(self.start_time, other.start_time)
+        t1 = min(self.end_time, other.end_time)
+        d0 = self._position_at(t0) - other._position_at(t0)
+        d1 = self._position_at(t1) - other._position_at(t1)
+        # relative position is linear in time
+        dd = d1 - d0
+        square_norm = dd.scalar_product(dd)
+        coef = 0. if square_norm == 0 else min(max(-d0.scalar_product(dd) / square_norm, 0.), 1.)
+        return Point.distance(d0 + dd * coef)
+
+
+class Conflict:
+    """
+    Two motions of different robots, reserving the same space at the same time.
+    """
+    __slots__ = ('first', 'second', 'start_time', 'end_time')
+
+    def __init__(self, first: Footprint, second: Footprint):
+        self.first = first
+        self.second = second
+        self.start_time = max(first.start_time, second.start_time)
+        self.end_time = min(first.end_time, second.end_time)
+
+    def __repr__(self):
+        return f'conflict({self.first.robot_id}#{self.first.index}, ' \
+               f'{self.second.robot_id}#{self.second.index}, ' \
+               f'[{self.start_time}, {self.end_time}])'
+
+
+class ReservationTable:
+    """
+    Uniform grid over space and time: each footprint is registered in the cells it covers,
+    so only footprints sharing a cell are compared.
+    """
+    DEFAULT_CELL_SIZE = 5.
+    DEFAULT_TIME_SLOT = 50.
+    DEFAULT_CLEARANCE = 0.5
+
+    def __init__(self, cell_size: float = DEFAULT_CELL_SIZE,
+                 time_slot: float = DEFAULT_TIME_SLOT,
+                 clearance: float = DEFAULT_CLEARANCE):
+        self.cell_size = cell_size
+        self.time_slot = time_slot
+        self.clearance = clearance
+        self.footprints: List[Footprint] = []
+        self._cells: Dict[Tuple[int, int, int], List[int]] = {}
+
+    def add_plan(self, robot_id, motions, motion_controller, start_time: float = 0.) -> float:
+        """
+        Reserves a plan, motions being timed by motion_controller
+        :param robot_id:
+        :param motions: planned motions
+        :param motion_controller: MotionController giving motion durations
+        :param start_time: time at which robot starts its plan
+        :return: end time of plan
+        """
+        time = start_time
+        for index, motion in enumerate(motions):
+            duration = motion_controller.plan_motion(motion)[1]
+            self.add(Footprint.new(robot_id, index, motion, time, duration, self.clearance))
+            time += duration
+        return time
+
+    def add(self, footprint: Footprint):
+        key = len(self.footprints)
+        self.footprints.append(footprint)
+        cells = self._cells
+        x_min, y_min, x_max, y_max = footprint.box
+        size, slot = self.cell_size, self.time_slot
+        for it in range(math.floor(footprint.start_time / slot), math.floor(footprint.end_time / slot) + 1):
+            for ix in range(math.floor(x_min / size), math.floor(x_max / size) + 1):
+                for iy in range(math.floor(y_min / size), math.floor(y_max / size) + 1):
+                    cells.setdefault((ix, iy, it), []).append(key)
+
+    def conflicts(self) -> List[Conflict]:
+        """
+        :return: conflicts between footprints of different robots, ordered by start time
+        """
+        footprints = self.footprints
+        clearance = self.clearance
+        checked = set()
+        conflicts = []
+        for keys in self._cells.values():
+            if len(keys) < 2:
+                continue
+            # sweep footprints of the cell by start time, comparing those overlapping in time
+            active = []
+            for key in sorted(keys, key=lambda k: footprints[k].start_time):
+                f = footprints[key]
+                active = [k for k in active if footprints[k].end_time > f.start_time]
+                for other in active:
+                    o = footprints[other]
+                    if o.robot_id == f.robot_id or (other, key) in checked:
+                        continue
+                    checked.add((other, key))
+                    if o.overlaps(f, clearance):
+                        conflicts.append(Conflict(o, f))
+                active.append(key)
+        conflicts.sort(key=lambda c: c.start_time)
+        return conflicts
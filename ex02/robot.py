@@ -1,18 +1,27 @@
+import asyncio
 import math
+import queue
+import threading
+from array import array
+from itertools import chain, islice
 
 from ex02.motion import Translation, Rotation
-from ex02.telecom import Telecom, Exchanger
-import inspect
-from typing import List
+from ex02.telecom import Telecom, Exchanger, AsyncExchanger
+from enum import Enum
+from typing import Callable, Dict, Iterable, Iterator, List
 
 from ex02.telecom import Command
-from ex02.geometry import Point, Arc, Geometry, Line
+from ex02.geometry import Point, Arc, ArcBatch, Geometry, Line
+from ex02.stats import Stats
+from ex02.plancache import PlanCache
 
 
 class RobotComponent:
     """
     Class for robot's component needing direct access to robot instance.
     """
+    # instrumentation, disabled when None
+    stats = None
 
     def __init__(self):
         self.robot = None
@@ -25,47 +34,116 @@ class RobotComponent:
         """
         self.robot = robot
 
-class Transmitter(RobotComponent, Exchanger):
+    def enable_stats(self, stats: Stats = None) -> Stats:
+        self.stats = stats if stats is not None else Stats()
+        return self.stats
 
-    def __init__(self):
-        super().__init__()
-        self._handlers = self._find_handlers_for_suffix(self, '_on_')
+    def disable_stats(self):
+        self.stats = None
 
-    @staticmethod
-    def _find_handlers_for_suffix(instance, prefix):
-        """
-        Find methods starting with prefix
-        :param instance:
-        :param prefix:
-        :return: a dictionary of functions indexed by postfix
-        """
 
-        def name(fn, prefix_):
-            return fn[0][len(prefix_):]
+def handles(*commands: Enum):
+    """
+    Marks a Transmitter method as the handler of commands, e.g. of a plugin command set
+    :param commands: handled commands
+    :return: decorator
+    """
+    def mark(fn):
+        fn.handled_commands = commands
+        return fn
+    return mark
+
+
+class Transmitter(RobotComponent, Exchanger):
+    # handlers indexed by command, collected once per class
+    _handlers = {}
+    # handlers registered by plugins, indexed by class then command
+    _registered_handlers = {}
 
-        def match(fn, prefix_):
-            return fn[0].startswith(prefix_)
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._handlers = cls._collect_handlers()
 
-        return {name(fn, prefix): getattr(instance, fn[0])
-                for fn in inspect.getmembers(instance, inspect.ismethod)
-                if match(fn, prefix)}
+    @classmethod
+    def _collect_handlers(cls) -> Dict[Enum, Callable]:
+        """
+        Collects handlers of class: methods named _on_<Command name>, methods marked with handles,
+        and handlers registered with register_handler, for the class and its base classes.
+        Handlers of a class replace the ones of its base classes.
+        :return: a dictionary of functions indexed by command
+        """
+        # method names, resolved on cls so that overridden methods are found, or registered functions
+        handlers = {}
+        for klass in reversed(cls.__mro__):
+            for name, fn in vars(klass).items():
+                if name.startswith('_on_') and name[len('_on_'):] in Command.__members__:
+                    handlers[Command[name[len('_on_'):]]] = name
+                for command in getattr(fn, 'handled_commands', ()):
+                    handlers[command] = name
+            handlers.update(Transmitter._registered_handlers.get(klass, {}))
+        return {command: getattr(cls, handler) if isinstance(handler, str) else handler
+                for command, handler in handlers.items()}
+
+    @classmethod
+    def register_handler(cls, command: Enum, fn: Callable[['Transmitter', Telecom], Telecom]):
+        """
+        Registers a handler of command for this class and its subclasses, e.g. from a plugin
+        :param command: handled command
+        :param fn: function called with transmitter and telecom
+        :return:
+        """
+        Transmitter._registered_handlers.setdefault(cls, {})[command] = fn
+        classes = [cls]
+        while classes:
+            klass = classes.pop()
+            klass._handlers = klass._collect_handlers()
+            classes.extend(klass.__subclasses__())
 
     """
     Transmitter Class
     """
 
     def exchange(self, tc: Telecom) -> Telecom:
-        cmd = tc.command
-        method = self._handlers[cmd.name]
-        return method(tc)
+        handler = self._handlers[tc.command]
+        if self.stats is None:
+            return handler(self, tc)
+        return self._timed_dispatch(handler, tc)
+
+    def _timed_dispatch(self, handler, tc: Telecom) -> Telecom:
+        stats = self.stats
+        start = stats.clock()
+        try:
+            return handler(self, tc)
+        finally:
+            stats.add_time(f'dispatch.{tc.command.name}', stats.clock() - start)
+
+    def exchange_many(self, tcs: Iterable[Telecom]) -> List[Telecom]:
+        """
+        Exchanges a batch of telecoms with the handler table looked up once
+        :param tcs: telecoms, processed in order
+        :return: responses, in the same order
+        """
+        handlers = self._handlers
+        responses = []
+        append = responses.append
+        timed = self.stats is not None
+        for tc in tcs:
+            if timed:
+                append(self._timed_dispatch(handlers[tc.command], tc))
+            else:
+                append(handlers[tc.command](self, tc))
+        return responses
+
+    def _is_robot_moving(self) -> bool:
+        return self.robot.is_moving()
 
     def _on_READY_FOR_LOADING(self, tc: Telecom) -> Telecom:
-        if self.robot.is_moving():
+        if self._is_robot_moving():
             return Telecom(command=Command.MOVING)
         return Telecom(command=tc.command)
 
     def _on_LOADING(self, tc: Telecom) -> Telecom:
-        if self.robot.is_moving():
+        if self._is_robot_moving():
             return Telecom(command=Command.MOVING)
 
         if not tc.payload:
@@ -84,12 +162,176 @@ class Transmitter(RobotComponent, Exchanger):
         except Exception as e:
             return Telecom(command=Command.INVALID, errors=[str(e)])
 
+    def _on_STATS(self, tc: Telecom) -> Telecom:
+        return Telecom(command=Command.STATS, payload=self.robot.get_stats())
+
+
+Transmitter._handlers = Transmitter._collect_handlers()
+
+
+class AsyncTransmitter(Transmitter, AsyncExchanger):
+    """
+    Transmitter answering telecoms while the robot moves, when exchanged with exchange_async.
+    MOVE starts the mission in an executor and is answered MOVING at once;
+    wait_mission gives the final MOVED or INVALID telecom.
+    LOADING plans the route in the executor too, the event loop is not blocked.
+    exchange and exchange_many keep the blocking Transmitter behaviour.
+    """
+
+    def __init__(self, executor=None):
+        super().__init__()
+        self.executor = executor
+        self.mission = None
+
+    async def exchange_async(self, tc: Telecom) -> Telecom:
+        if tc.command is Command.MOVE:
+            return self._start_mission(tc)
+        if tc.command is Command.LOADING:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, self.exchange, tc)
+        return self.exchange(tc)
+
+    def _is_robot_moving(self) -> bool:
+        return self._is_mission_running() or self.robot.is_moving()
+
+    def _is_mission_running(self) -> bool:
+        return self.mission is not None and not self.mission.done()
+
+    def _start_mission(self, tc: Telecom) -> Telecom:
+        if not self._is_robot_moving():
+            loop = asyncio.get_running_loop()
+            self.mission = loop.run_in_executor(self.executor, self._on_MOVE, tc)
+        return Telecom(command=Command.MOVING)
+
+    async def wait_mission(self) -> Telecom:
+        """
+        Waits for the end of the current mission
+        :return: MOVED or INVALID telecom
+        """
+        if self.mission is None:
+            raise ValueError("No mission started")
+        return await self.mission
+
 
 class Wheel:
 
     def run(self, length):
         pass
 
+    def run_profile(self, lengths):
+        """
+        Runs a whole step profile
+        :param lengths: sequence of step lengths
+        :return:
+        """
+        for length in lengths:
+            self.run(length)
+
+    def end_motion(self):
+        """
+        Called once all steps of a motion are run
+        :return:
+        """
+        pass
+
+
+class WheelDrive:
+    """
+    Drives both wheels of each step, right wheel then left wheel
+    """
+
+    def __init__(self, right_wheel: Wheel, left_wheel: Wheel):
+        self.right_wheel = right_wheel
+        self.left_wheel = left_wheel
+
+    def step(self, right_length, left_length):
+        self.right_wheel.run(right_length)
+        self.left_wheel.run(left_length)
+
+    def run_profile(self, right_lengths, left_lengths):
+        self.right_wheel.run_profile(right_lengths)
+        self.left_wheel.run_profile(left_lengths)
+
+    def end_motion(self):
+        self.right_wheel.end_motion()
+        self.left_wheel.end_motion()
+
+    def close(self):
+        pass
+
+
+class ConcurrentWheelDrive(WheelDrive):
+    """
+    Drives each wheel from its own worker thread and command queue.
+    Both workers are released together by a barrier, and each step returns once both wheels are done.
+    Stats times steps, from submission to completion, and skew between wheel starts.
+    """
+
+    def __init__(self, right_wheel: Wheel, left_wheel: Wheel):
+        super().__init__(right_wheel, left_wheel)
+        self.stats = Stats()
+        self._start = threading.Barrier(2)
+        self._done = threading.Barrier(3)
+        self._queues = (queue.SimpleQueue(), queue.SimpleQueue())
+        self._started = [0., 0.]
+        self._errors = [None, None]
+        self._workers = [threading.Thread(target=self._work, args=(idx,), name=f'{name}-wheel', daemon=True)
+                         for idx, name in enumerate(('right', 'left'))]
+        for worker in self._workers:
+            worker.start()
+
+    def _work(self, idx):
+        commands = self._queues[idx]
+        clock = self.stats.clock
+        while True:
+            command = commands.get()
+            if command is None:
+                return
+            method, args = command
+            try:
+                self._start.wait()
+                self._started[idx] = clock()
+                method(*args)
+            except BaseException as e:
+                self._errors[idx] = e
+            finally:
+                self._done.wait()
+
+    def _dispatch(self, right_command, left_command):
+        stats = self.stats
+        start = stats.clock()
+        self._queues[0].put(right_command)
+        self._queues[1].put(left_command)
+        self._done.wait()
+        stats.add_time('step', stats.clock() - start)
+        stats.add_time('skew', math.fabs(self._started[0] - self._started[1]))
+        errors = self._errors
+        error = errors[0] if errors[0] is not None else errors[1]
+        if error is not None:
+            errors[0] = errors[1] = None
+            raise error
+
+    def step(self, right_length, left_length):
+        self._dispatch((self.right_wheel.run, (right_length,)), (self.left_wheel.run, (left_length,)))
+
+    def run_profile(self, right_lengths, left_lengths):
+        self._dispatch((self.right_wheel.run_profile, (right_lengths,)),
+                       (self.left_wheel.run_profile, (left_lengths,)))
+
+    def end_motion(self):
+        self._dispatch((self.right_wheel.end_motion, ()), (self.left_wheel.end_motion, ()))
+
+    def close(self):
+        """
+        Stops workers
+        :return:
+        """
+        for commands in self._queues:
+            commands.put(None)
+        for worker in self._workers:
+            worker.join()
+
+
 class EnergySupplier(RobotComponent):
     """Energy supplier is an energy tank"""
 
@@ -98,25 +340,66 @@ class EnergySupplier(RobotComponent):
 
     def consume(self, quantity: float) -> float:
         self.quantity = self.quantity - quantity
+        if self.stats is not None:
+            self.stats.incr('energy', quantity)
 
     def has_enough(self, quantity: float) -> float:
         return quantity < self.quantity
 
 
+class StepProfile:
+    """
+    Step lengths of both wheels for a whole motion, and energy it requires.
+    """
+    __slots__ = ('right', 'left', 'energy', 'duration', 'times')
+
+    def __init__(self, right: array, left: array, energy: float, duration: float, times: array = None):
+        """
+        :param right: right wheel step lengths
+        :param left: left wheel step lengths
+        :param energy: energy of the whole motion
+        :param duration: duration of the whole motion
+        :param times: duration of each step, None when all steps last the same time
+        """
+        self.right = right
+        self.left = left
+        self.energy = energy
+        self.duration = duration
+        self.times = times
+
+    @property
+    def steps(self):
+        return len(self.right)
+
+
 class MotionController(RobotComponent):
     CONSUMPTION_PER_LENGTH_UNIT = 1
     DEFAULT_WHEEL_AXIS_LENGTH = 1
     DEFAULT_TIME_STEP = 0.1
     DEFAULT_SPEED = 0.1
+    DEFAULT_ACCELERATION = 0.1
+    DEFAULT_CRUISE_TIME_STEP = 1.0
+    CONSTANT_PROFILE = 'constant'
+    TRAPEZOIDAL_PROFILE = 'trapezoidal'
 
     def __init__(self, right_wheel: Wheel, left_wheel: Wheel, configuration):
         self.right_wheel = right_wheel
         self.left_wheel = left_wheel
+        if configuration.get('concurrent', False):
+            self.drive = ConcurrentWheelDrive(right_wheel, left_wheel)
+        else:
+            self.drive = WheelDrive(right_wheel, left_wheel)
 
         self.speed = configuration.get('speed', MotionController.DEFAULT_SPEED)
         self.time_step = configuration.get('time_step', MotionController.DEFAULT_TIME_STEP)
         self.consumption_per_length_unit = configuration.get('consumption_per_length_unit',
                                                              MotionController.CONSUMPTION_PER_LENGTH_UNIT)
+        self.batched = configuration.get('batched', False)
+        self.profile = configuration.get('profile', MotionController.CONSTANT_PROFILE)
+        if self.profile not in (MotionController.CONSTANT_PROFILE, MotionController.TRAPEZOIDAL_PROFILE):
+            raise ValueError(f"Velocity profile {self.profile} can not be understood")
+        self.acceleration = configuration.get('acceleration', MotionController.DEFAULT_ACCELERATION)
+        self.cruise_time_step = configuration.get('cruise_time_step', MotionController.DEFAULT_CRUISE_TIME_STEP)
         self.configuration = configuration
         super().__init__()
 
@@ -125,57 +408,170 @@ class MotionController(RobotComponent):
         Runs translation
         :param translation:
         :param energy_supplier: EnergySupplier to supply energy for translation
-        :return:
+        :return: nb of run steps
         """
-        length = translation.length
-        steps, length_step, duration = self._compute_step_param(length)
-        consumption_per_step = self.get_required_energy_for(length_step)
-
-        for s in range(steps):
-            self.right_wheel.run(length_step)
-            self.left_wheel.run(length_step)
-            energy_supplier.consume(2 * consumption_per_step)
+        return self._run_steps(*self._translation_steps(translation), energy_supplier)
 
     def run_rotation(self, rotation: 'Rotation', energy_supplier: 'EnergySupplier'):
         """
         Runs rotation
         :param rotation:
         :param energy_supplier:
-        :return:
+        :return: nb of run steps
         """
-        wheel_axis = self.configuration.get('wheel_axis_length', MotionController.DEFAULT_WHEEL_AXIS_LENGTH)
+        wheel_axis = self._get_wheel_axis()
 
         if rotation.is_on_the_spot():
-            self._run_rotation_on_spot(rotation, wheel_axis, energy_supplier)
-        else:
-            self._run_rotation_on_center(rotation, wheel_axis, energy_supplier)
+            return self._run_rotation_on_spot(rotation, wheel_axis, energy_supplier)
+        return self._run_rotation_on_center(rotation, wheel_axis, energy_supplier)
+
+    def close(self):
+        """
+        Stops wheel drive, e.g. its worker threads
+        :return:
+        """
+        self.drive.close()
+
+    def _get_wheel_axis(self):
+        return self.configuration.get('wheel_axis_length', MotionController.DEFAULT_WHEEL_AXIS_LENGTH)
 
     def _compute_step_param(self, length):
-        duration = math.fabs(length) / self.speed
-        steps = math.floor(duration / self.time_step)
+        steps = max(1, math.floor(math.fabs(length) / self.speed / self.time_step))
         length_step = length / steps
-        return steps, length_step, duration
+        # each step lasts time_step
+        return steps, length_step, steps * self.time_step
 
     def move(self, motion, energy_supplier):
+        try:
+            if self.stats is None:
+                self._move(motion, energy_supplier)
+            else:
+                self._timed_move(motion, energy_supplier)
+        finally:
+            # steps already run are flushed, even when motion is interrupted
+            self.drive.end_motion()
+
+    def _move(self, motion, energy_supplier) -> int:
+        """
+        :return: nb of run steps
+        """
+        if self.profile == MotionController.TRAPEZOIDAL_PROFILE:
+            return self._run_varying_steps(self.compute_profile(motion), energy_supplier)
+        elif isinstance(motion, Translation):
+            return self.run_translation(motion, energy_supplier)
+        elif isinstance(motion, Rotation):
+            return self.run_rotation(motion, energy_supplier)
+        raise ValueError(f"Motion {motion} can not be understood")
+
+    def _timed_move(self, motion, energy_supplier):
+        stats = self.stats
+        start = stats.clock()
+        steps = 0
+        try:
+            steps = self._move(motion, energy_supplier)
+        finally:
+            stats.add_time(f'move.{type(motion).__name__}', stats.clock() - start)
+            stats.incr('steps', steps)
+
+    def compute_profile(self, motion) -> StepProfile:
+        """
+        Computes the whole step profile of a motion, without running it
+        :param motion: Translation or Rotation
+        :return: StepProfile
+        """
+        if self.profile == MotionController.TRAPEZOIDAL_PROFILE:
+            return self._trapezoidal_profile(*self._motion_lengths(motion))
+        return self._make_profile(*self._motion_steps(motion))
+
+    def _motion_steps(self, motion):
         if isinstance(motion, Translation):
-            self.run_translation(motion, energy_supplier)
+            return self._translation_steps(motion)
         elif isinstance(motion, Rotation):
-            self.run_rotation(motion, energy_supplier)
-        else:
-            raise ValueError(f"Motion {motion} can not be understood")
+            return self._rotation_steps(motion, self._get_wheel_axis())
+        raise ValueError(f"Motion {motion} can not be understood")
+
+    def plan_motion(self, motion):
+        """
+        Computes, in closed form, energy and duration a motion will require when moved.
+        :param motion: Translation or Rotation
+        :return: (energy, duration)
+        """
+        if self.profile == MotionController.TRAPEZOIDAL_PROFILE:
+            right_length, left_length = self._motion_lengths(motion)
+            t_acc, t_cruise, _ = self._trapezoid(max(math.fabs(right_length), math.fabs(left_length)))
+            return (self.get_required_energy_for(right_length) + self.get_required_energy_for(left_length),
+                    2 * t_acc + t_cruise)
+        steps, right_len_step, left_len_step, consumption_per_step, duration = self._motion_steps(motion)
+        return steps * consumption_per_step, duration
+
+    def get_required_energy_for_motions(self, motions) -> float:
+        plan_motion = self.plan_motion
+        total = 0.
+        for motion in motions:
+            total += plan_motion(motion)[0]
+        return total
+
+    def get_duration_for_motions(self, motions) -> float:
+        plan_motion = self.plan_motion
+        total = 0.
+        for motion in motions:
+            total += plan_motion(motion)[1]
+        return total
+
+    @staticmethod
+    def _make_profile(steps, right_len_step, left_len_step, consumption_per_step, duration):
+        return StepProfile(right=array('d', [right_len_step]) * steps,
+                           left=array('d', [left_len_step]) * steps,
+                           energy=steps * consumption_per_step,
+                           duration=duration)
+
+    def run_profile(self, profile: StepProfile, energy_supplier: 'EnergySupplier'):
+        """
+        Hands a whole step profile to the wheels and settles energy once
+        :param profile: StepProfile
+        :param energy_supplier:
+        :return:
+        """
+        self.drive.run_profile(profile.right, profile.left)
+        energy_supplier.consume(profile.energy)
+
+    def _run_steps(self, steps, right_len_step, left_len_step, consumption_per_step, duration, energy_supplier):
+        if self.batched:
+            profile = self._make_profile(steps, right_len_step, left_len_step, consumption_per_step, duration)
+            self.run_profile(profile, energy_supplier)
+            return steps
+
+        step = self.drive.step
+        for s in range(steps):
+            step(right_len_step, left_len_step)
+            energy_supplier.consume(consumption_per_step)
+        return steps
+
+    def _translation_steps(self, translation):
+        length = translation.length
+        steps, length_step, duration = self._compute_step_param(length)
+        consumption_per_step = self.get_required_energy_for(length_step)
+        return steps, length_step, length_step, 2 * consumption_per_step, duration
+
+    def _rotation_steps(self, rotation, wheel_axis):
+        if rotation.is_on_the_spot():
+            return self._rotation_on_spot_steps(rotation, wheel_axis)
+        return self._rotation_on_center_steps(rotation, wheel_axis)
 
     def _run_rotation_on_spot(self, rotation, wheel_axis, energy_supplier):
+        return self._run_steps(*self._rotation_on_spot_steps(rotation, wheel_axis), energy_supplier)
+
+    def _rotation_on_spot_steps(self, rotation, wheel_axis):
         angle = rotation.arc.angle
         length = angle * wheel_axis / 2
         steps, length_step, duration = self._compute_step_param(length)
         consumption_per_step = self.get_required_energy_for(length_step)
-
-        for s in range(steps):
-            self.right_wheel.run(length_step)
-            self.left_wheel.run(-length_step)
-            energy_supplier.consume(2 * consumption_per_step)
+        return steps, length_step, -length_step, 2 * consumption_per_step, duration
 
     def _run_rotation_on_center(self, rotation, wheel_axis, energy_supplier):
+        return self._run_steps(*self._rotation_on_center_steps(rotation, wheel_axis), energy_supplier)
+
+    def _rotation_on_center_steps(self, rotation, wheel_axis):
         angle = rotation.arc.angle
         radius = rotation.arc.radius
 
@@ -199,36 +595,285 @@ class MotionController(RobotComponent):
         consumption_per_step = self.get_required_energy_for(left_len_step) \
                                + self.get_required_energy_for(right_len_step)
 
-        for s in range(steps):
-            self.right_wheel.run(right_len_step)
-            self.left_wheel.run(left_len_step)
-            energy_supplier.consume(consumption_per_step)
+        return steps, right_len_step, left_len_step, consumption_per_step, duration
 
     def get_required_energy_for(self, length: float):
-        return self.consumption_per_length_unit * length
+        return self.consumption_per_length_unit * math.fabs(length)
+
+    def _motion_lengths(self, motion):
+        """
+        Whole lengths both wheels run for a motion
+        :param motion: Translation or Rotation
+        :return: (right length, left length)
+        """
+        if isinstance(motion, Translation):
+            return motion.length, motion.length
+        if not isinstance(motion, Rotation):
+            raise ValueError(f"Motion {motion} can not be understood")
+        wheel_axis = self._get_wheel_axis()
+        angle = motion.arc.angle
+        if motion.is_on_the_spot():
+            length = angle * wheel_axis / 2
+            return length, -length
+        radius = motion.arc.radius
+        big_length = math.fabs((radius + wheel_axis / 2) * angle)
+        short_length = (radius - wheel_axis / 2) / (radius + wheel_axis / 2) * big_length
+        if motion.arc.direction == Arc.DIRECT:
+            return big_length, short_length
+        return short_length, big_length
+
+    def _trapezoid(self, distance):
+        """
+        Trapezoidal velocity profile of the driving wheel: it accelerates up to speed, cruises, then decelerates.
+        Short motions never reach speed, and their profile is a triangle.
+        :param distance: length run by the driving wheel
+        :return: (acceleration time, cruise time, peak speed)
+        """
+        if distance * self.acceleration >= self.speed * self.speed:
+            return self.speed / self.acceleration, distance / self.speed - self.speed / self.acceleration, self.speed
+        peak = math.sqrt(distance * self.acceleration)
+        return peak / self.acceleration, 0., peak
+
+    def _trapezoidal_step_counts(self, t_acc, t_cruise):
+        """
+        Steps last time_step while speed changes, and up to cruise_time_step while cruising.
+        :return: (steps of acceleration, steps of cruise)
+        """
+        n_acc = max(1, math.ceil(t_acc / self.time_step))
+        n_cruise = math.ceil(t_cruise / self.cruise_time_step) if t_cruise > 0 else 0
+        return n_acc, n_cruise
 
+    def _trapezoidal_profile(self, right_length, left_length) -> StepProfile:
+        """
+        Step profile of a trapezoidal velocity profile. Step lengths are differences of the travelled distance
+        at step boundaries, so they sum up to the whole lengths.
+        :param right_length: whole length of right wheel
+        :param left_length: whole length of left wheel
+        :return: StepProfile, with duration of each step
+        """
+        distance = max(math.fabs(right_length), math.fabs(left_length))
+        t_acc, t_cruise, peak = self._trapezoid(distance)
+        n_acc, n_cruise = self._trapezoidal_step_counts(t_acc, t_cruise)
+        acceleration = self.acceleration
+        d_acc = peak * t_acc / 2
+        acc_step = t_acc / n_acc
+
+        times = array('d', [acc_step]) * n_acc
+        travelled = array('d', (acceleration * (k * acc_step) ** 2 / 2 for k in range(1, n_acc + 1)))
+        if n_cruise:
+            cruise_step = t_cruise / n_cruise
+            times.extend(array('d', [cruise_step]) * n_cruise)
+            travelled.extend(d_acc + peak * cruise_step * k for k in range(1, n_cruise + 1))
+        times.extend(array('d', [acc_step]) * n_acc)
+        travelled.extend(distance - acceleration * ((n_acc - k) * acc_step) ** 2 / 2 for k in range(1, n_acc))
+        travelled.append(distance)
+
+        right_ratio = right_length / distance if distance else 0.
+        left_ratio = left_length / distance if distance else 0.
+        right = array('d', [0.]) * len(travelled)
+        left = array('d', [0.]) * len(travelled)
+        previous = 0.
+        for i, current in enumerate(travelled):
+            step = current - previous
+            right[i] = right_ratio * step
+            left[i] = left_ratio * step
+            previous = current
+        return StepProfile(right=right, left=left,
+                           energy=self.get_required_energy_for(right_length) + self.get_required_energy_for(left_length),
+                           duration=2 * t_acc + t_cruise,
+                           times=times)
+
+    def _run_varying_steps(self, profile: StepProfile, energy_supplier: 'EnergySupplier'):
+        if self.batched:
+            self.run_profile(profile, energy_supplier)
+            return len(profile.right)
+
+        get_required_energy_for = self.get_required_energy_for
+        step = self.drive.step
+        for right_len_step, left_len_step in zip(profile.right, profile.left):
+            step(right_len_step, left_len_step)
+            energy_supplier.consume(get_required_energy_for(right_len_step) + get_required_energy_for(left_len_step))
+        return len(profile.right)
+
+
+class NavigationPlan:
+    """
+    Last computed plan, kept by Navigator to replan edited routes.
+    Motions of translation i are motions[offsets[i]:offsets[i + 1]],
+    skips[i] is the arrangement state before translation i.
+    """
+    __slots__ = ('step', 'points', 'translations', 'motions', 'offsets', 'skips')
+
+    def __init__(self, step, points, translations, motions, offsets, skips):
+        self.step = step
+        self.points = points
+        self.translations = translations
+        self.motions = motions
+        self.offsets = offsets
+        self.skips = skips
 
 
 class Navigator(RobotComponent):
+    # last plan, reused by compute_motions when a route is partly edited
+    plan = None
 
-    def __init__(self, arranger: 'Arranger'):
+    def __init__(self, arranger: 'Arranger', tolerance: float = None, plan_cache: PlanCache = None):
+        """
+        :param arranger: Arranger inserting rotations
+        :param tolerance: if given, positions closer than tolerance to the simplified path are dropped
+        :param plan_cache: optional PlanCache, giving motions computed before, e.g. before a restart
+        """
+        super().__init__()
         self.arranger = arranger
+        self.tolerance = tolerance
+        self.plan_cache = plan_cache
 
     def compute_motions(self, positions):
+        """
+        Computes motions. Only the part of the route differing from
+        the previous call is planned again, unless arranger overrides arrange:
+        its arrange is then called on the whole route.
+        :param positions: (x, y) positions
+        :return: motion list
+        """
+        stats = self.stats
+        if stats is not None:
+            start = stats.clock()
         points = self.to_points(positions)
-        motions = self.to_translations(points)
-        new_motions = self.arrange_translations(motions)
+        if self.plan_cache is not None:
+            key = self._plan_key(points)
+            new_motions = self.plan_cache.get(key)
+            if new_motions is not None:
+                self.plan = None
+                if stats is not None:
+                    stats.add_time('planning', stats.clock() - start)
+                    stats.incr('cached_plans')
+                return new_motions
+        if self.tolerance is not None:
+            points = Geometry.simplify(points, self.tolerance)
+        step = None
+        if len(points) > 1 and type(self.arranger).arrange is Arranger.arrange:
+            step = self.arranger.get_arrange_step(len(points) - 1)
+        if step is None:
+            self.plan = None
+            motions = self.to_translations(points)
+            new_motions = self.arrange_translations(motions)
+        else:
+            self.plan = self._replan(self.plan, points, step)
+            new_motions = self.plan.motions
+        if self.plan_cache is not None:
+            self.plan_cache.put(key, new_motions)
+        if stats is not None:
+            stats.add_time('planning', stats.clock() - start)
+            stats.incr('planned_motions', len(new_motions))
         return new_motions
 
+    def _plan_key(self, points: List[Point]) -> str:
+        configuration = self.robot.motion_controller.configuration if self.robot is not None else None
+        return self.plan_cache.key(points, self.arranger, configuration, self.tolerance)
+
+    @staticmethod
+    def _same_point(a: Point, b: Point) -> bool:
+        return a.x == b.x and a.y == b.y
+
+    def _replan(self, plan: NavigationPlan, points: List[Point], step) -> NavigationPlan:
+        """
+        Plans points, reusing translations and arranged motions of plan
+        outside the window of edited points.
+        """
+        same = Navigator._same_point
+        size = len(points)
+        old_size = 0
+        prefix = suffix = 0
+        if plan is not None and plan.step == step:
+            old_points = plan.points
+            old_size = len(old_points)
+            common = min(size, old_size)
+            while prefix < common and same(points[prefix], old_points[prefix]):
+                prefix += 1
+            while suffix < common - prefix and same(points[-1 - suffix], old_points[-1 - suffix]):
+                suffix += 1
+        shift = old_size - size
+
+        # translation i joins points i and i + 1
+        reused_head = max(prefix - 1, 0)
+        reused_tail = size - suffix
+        translations = plan.translations[:reused_head] if reused_head else []
+        start = points[reused_head]
+        for p in points[reused_head + 1:max(reused_tail + 1, reused_head + 1)]:
+            translations.append(Translation(start, p))
+            start = p
+        if reused_tail < size - 1:
+            translations.extend(plan.translations[reused_tail + shift:])
+
+        # motions of translation i depend on translations i - 1, i and i + 1
+        count = len(translations)
+        first = max(prefix - 2, 0)
+        if first:
+            motions = plan.motions[:plan.offsets[first]]
+            offsets = plan.offsets[:first + 1]
+            skips = plan.skips[:first + 1]
+        else:
+            motions, offsets, skips = [], array('q', [0]), bytearray([0])
+
+        idx = first
+        skip = bool(skips[idx])
+        batch_size = self.arranger.BATCH_SIZE
+        if first == 0 and suffix == 0 and step is Arranger._arrange_step \
+                and batch_size is not None and count >= batch_size:
+            # whole route is planned: corner arcs are computed by one ArcBatch
+            motions = Arranger._arrange_batch(translations, offsets)
+            skips.extend(bytes(count))
+            idx = count
+        while idx < count:
+            if idx > reused_tail and skip == plan.skips[idx + shift]:
+                # same neighbours and state as old translation: reuse the end of old plan
+                old_idx = idx + shift
+                delta = len(motions) - plan.offsets[old_idx]
+                motions.extend(plan.motions[plan.offsets[old_idx]:])
+                offsets.extend(o + delta for o in plan.offsets[old_idx + 1:])
+                skips.extend(plan.skips[old_idx + 1:])
+                break
+            prev_ = translations[idx - 1] if idx > 0 else None
+            next_ = translations[idx + 1] if idx + 1 < count else None
+            skip = step(prev_, translations[idx], next_, skip, motions)
+            offsets.append(len(motions))
+            skips.append(skip)
+            idx += 1
+
+        return NavigationPlan(step, points, translations, motions, offsets, skips)
+
+    def iter_motions(self, positions: Iterable) -> Iterator:
+        """
+        Streaming version of compute_motions: motions are produced lazily,
+        from any iterable of positions. Simplification is made in one pass,
+        see Geometry.iter_simplify.
+        :param positions: iterable of (x, y) positions
+        :return: motion iterator
+        """
+        points = self.iter_points(positions)
+        if self.tolerance is not None:
+            points = Geometry.iter_simplify(points, self.tolerance)
+        translations = self.iter_translations(points)
+        return self.arranger.iter_arrange(translations)
+
     def compute_total_distance(self, motions):
-        return super(len(m) for m in motions)
+        return sum(m.get_length() for m in motions)
 
     def arrange_translations(self, translations):
         return self.arranger.arrange(translations)
 
     def to_points(self, positions):
+        # point sources, e.g. PointArray or RouteFile, give their points directly
+        if hasattr(positions, 'to_points'):
+            return positions.to_points()
         return list([Point.new(xy) for xy in positions])
 
+    def iter_points(self, positions: Iterable) -> Iterator[Point]:
+        if hasattr(positions, 'iter_points'):
+            return positions.iter_points()
+        return (Point.new(xy) for xy in positions)
+
     def to_translations(self, points):
         """
         Converts points into motion collection
@@ -242,65 +887,148 @@ class Navigator(RobotComponent):
             start = p
         return translations
 
+    def iter_translations(self, points: Iterable[Point]) -> Iterator[Translation]:
+        """
+        Converts points into a translation stream
+        :param points: point iterable
+        :return: translation iterator
+        """
+        start = None
+        for p in points:
+            if start is not None:
+                yield Translation(start, p)
+            start = p
+
 
 class Arranger:
+    """
+    Inserts rotations between translations. Arrangement is made of steps:
+    each step appends the motions of one input translation, knowing its neighbours.
+    """
+    # routes of at least BATCH_SIZE motions get their corner arcs from one ArcBatch, None to disable
+    BATCH_SIZE = 64
 
     def arrange(self, motions: List) -> List:
+        size = len(motions)
+        step = self.get_arrange_step(size)
+        if step is Arranger._arrange_step and self.BATCH_SIZE is not None and size >= self.BATCH_SIZE:
+            return self._arrange_batch(motions)
+
         new_motions = []
-        previous_move = None
-        for move in motions:
-            if previous_move:
-                if not previous_move.is_parallel_with(move):
-                    rotation = Rotation.new_from_translations(previous_move, move)
-                    new_motions.append(rotation)
-            previous_move = move
-            new_motions.append(move)
+        skip = False
+        for idx, current in enumerate(motions):
+            prev_ = motions[idx - 1] if idx > 0 else None
+            next_ = motions[idx + 1] if idx + 1 < size else None
+            skip = step(prev_, current, next_, skip, new_motions)
+
         return new_motions
 
-class CurveArranger(Arranger):
+    @staticmethod
+    def _arrange_batch(motions: List, offsets: array = None) -> List:
+        """
+        Same arrangement as _arrange_step, with the rotations of all corners computed by one ArcBatch
+        :param motions: translations
+        :param offsets: if given, gets the nb of arranged motions after each translation, see NavigationPlan
+        :return: arranged motions
+        """
+        corners = [idx for idx in range(1, len(motions)) if not motions[idx - 1].is_parallel_with(motions[idx])]
+        batch = ArcBatch.from_points((motions[idx - 1].end for idx in corners),
+                                     (motions[idx].start for idx in corners),
+                                     (motions[idx - 1].vector for idx in corners),
+                                     (motions[idx].vector for idx in corners))
+        centers, radii, angles, lengths = batch.centers, batch.radii, batch.angles, batch.lengths
+        restore_arc, restore_rotation = Arc._restore, Rotation._restore
+        new_motions = []
+        previous = 0
+        for k, idx in enumerate(corners):
+            new_motions.extend(motions[previous:idx])
+            if offsets is not None:
+                offsets.extend(range(len(new_motions) - idx + previous + 1, len(new_motions) + 1))
+            # arc reuses the points of its translations, see ArcBatch.arc
+            prev_, current = motions[idx - 1], motions[idx]
+            arc = restore_arc(prev_.end, current.start, prev_.vector, current.vector, centers[k],
+                              radii[k], angles[k], batch.direction(k), lengths[k])
+            new_motions.append(restore_rotation(arc))
+            previous = idx
+        new_motions.extend(motions[previous:])
+        if offsets is not None:
+            offsets.extend(range(len(new_motions) - len(motions) + previous + 1, len(new_motions) + 1))
+        return new_motions
 
-    def arrange(self, motions: List) -> List:
-        size = len(motions)
+    def iter_arrange(self, motions: Iterable) -> Iterator:
+        motions = iter(motions)
+        head = list(islice(motions, 3))
+        step = self.get_arrange_step(len(head))
+
+        chunk = []
+        skip = False
+        prev_ = None
+        following = chain(head, motions, (None, None))
+        current, next_ = next(following), next(following)
+        while current is not None:
+            skip = step(prev_, current, next_, skip, chunk)
+            yield from chunk
+            chunk.clear()
+            prev_, current, next_ = current, next_, next(following)
+
+    def get_arrange_step(self, size: int):
+        """
+        Gives the step function used to arrange size motions, see _arrange_step.
+        Subclasses overriding arrange without steps have to return None.
+        :param size: nb of motions to arrange (3 means 3 or more)
+        :return: step function, or None
+        """
+        return self._arrange_step
 
-        if size < 3:
-            return super().arrange()
-
-        new_motions = [i for i in motions]
-        previous_move = None
-
-        idx = 0
-        while idx < len(new_motions):
-            next_ = prev_ = None
-            current = new_motions[idx]
-            if idx-1 >= 0:
-                prev_ = new_motions[idx-1]
-            if idx+1 < len(new_motions):
-                next_ = new_motions[idx+1]
-
-            if prev_ and next_ and isinstance(prev_, Translation) and isinstance(next_, Translation):
-
-                if not prev_.is_parallel_with(current) and not next_.is_parallel_with(current):
-                    line0 = Line(prev_.end, prev_.vector)
-                    line1 = Line(next_.start, next_.vector)
-                    another_point = Geometry.get_tangent_point_from_lines(line0, line1)
-                    if Geometry.is_beyond_point(another_point,prev_.end, prev_.vector):
-                        new_motions.insert(idx, Translation(prev_.end, another_point))
-                        idx += 1
-                        rot = Rotation(another_point, next_.start, prev_.vector, next_.vector)
-                        new_motions[idx] = rot
-                    else :
-                        rot = Rotation.new_from_translations(prev_, current)
-                        new_motions.insert(idx, rot)
-            elif prev_ is not None and isinstance(prev_, Translation):
-                rot = Rotation.new_from_translations(prev_, current)
-                new_motions.insert(idx, rot)
+    @staticmethod
+    def _arrange_step(prev_, current, next_, skip, new_motions) -> bool:
+        """
+        Appends current motion, preceded by a rotation from prev_ if they are not parallel.
+        :return: False, next motion is never skipped
+        """
+        if prev_ and not prev_.is_parallel_with(current):
+            new_motions.append(Rotation.new_from_translations(prev_, current))
+        new_motions.append(current)
+        return False
 
-            idx += 1
 
-        return new_motions
+class CurveArranger(Arranger):
 
+    def get_arrange_step(self, size: int):
+        if size < 3:
+            return super()._arrange_step
+        return self._arrange_step
 
+    @staticmethod
+    def _arrange_step(prev_, current, next_, skip, new_motions) -> bool:
+        """
+        Appends current motion, and the motions joining it to prev_, to new_motions.
+        :param prev_: previous motion of the input, or None
+        :param current: motion to arrange
+        :param next_: next motion of the input, or None
+        :param skip: True if current was already joined by a curve at the previous step
+        :return: True if next motion is already joined by a curve
+        """
+        if skip or not isinstance(prev_, Translation):
+            new_motions.append(current)
+            return False
+
+        if isinstance(next_, Translation):
+            if not prev_.is_parallel_with(current) and not next_.is_parallel_with(current):
+                line0 = Line(prev_.end, prev_.vector)
+                line1 = Line(next_.start, next_.vector)
+                another_point = Geometry.get_tangent_point_from_lines(line0, line1)
+                if Geometry.is_beyond_point(another_point, prev_.end, prev_.vector):
+                    # current is replaced by a curve up to next_
+                    new_motions.append(Translation(prev_.end, another_point))
+                    new_motions.append(Rotation(another_point, next_.start, prev_.vector, next_.vector))
+                    return True
+                new_motions.append(Rotation.new_from_translations(prev_, current))
+        else:
+            new_motions.append(Rotation.new_from_translations(prev_, current))
 
+        new_motions.append(current)
+        return False
 
 
 class Robot(Exchanger):
@@ -325,25 +1053,76 @@ class Robot(Exchanger):
         self.navigator.register(self)
         self.energy_supplier.register(self)
 
+    def _components(self):
+        return {'transmitter': self.transmitter,
+                'motion_controller': self.motion_controller,
+                'navigator': self.navigator,
+                'energy_supplier': self.energy_supplier}
+
+    def enable_stats(self):
+        for component in self._components().values():
+            component.enable_stats()
+
+    def disable_stats(self):
+        for component in self._components().values():
+            component.disable_stats()
+
+    def get_stats(self) -> dict:
+        """
+        :return: stats snapshot by component name, for components with enabled stats
+        """
+        return {name: component.stats.snapshot()
+                for name, component in self._components().items()
+                if component.stats is not None}
+
     def exchange(self, tc: Telecom) -> Telecom:
         return self.transmitter.exchange(tc)
 
+    def exchange_many(self, tcs: Iterable[Telecom]) -> List[Telecom]:
+        return self.transmitter.exchange_many(tcs)
+
     def load_positions(self, positions: List):
         motions = self.navigator.compute_motions(positions)
-        total_length = self.navigator.compute_total_distance(motions)
-        total_energy = self.motion_controller.get_required_energy_for(total_length)
+        total_energy = self.motion_controller.get_required_energy_for_motions(motions)
         if not self.energy_supplier.has_enough(total_energy):
             raise ValueError("Not enough energy")
         self.motions = motions
 
-    def run(self):
-        if len(self.motions) > 0:
-            self.status = Robot.STATUS_MOVING
-            for motion in self.motions:
-                self.motion_controller.move(motion)
-            self.status = Robot.STATUS_MOTIONLESS
-        else:
+    def run(self, motions: Iterable = None):
+        """
+        Runs loaded motions, or the given motion iterable (e.g. Navigator.iter_motions)
+        :param motions: optional motion stream, consumed while moving
+        :return:
+        """
+        if motions is None:
+            motions = self.motions
+        motions = iter(motions)
+        first = next(motions, None)
+        if first is None:
             raise ValueError("Empty motion list")
 
+        self.status = Robot.STATUS_MOVING
+        try:
+            for motion in chain((first,), motions):
+                self.motion_controller.move(motion, self.energy_supplier)
+        finally:
+            self.status = Robot.STATUS_MOTIONLESS
+
+    def run_positions(self, positions: Iterable):
+        """
+        Plans and runs positions as a stream, without loading them first.
+        Energy is checked before each motion, as the whole route is not known up front.
+        :param positions: iterable of (x, y) positions
+        :return:
+        """
+        self.run(self._with_energy_check(self.navigator.iter_motions(positions)))
+
+    def _with_energy_check(self, motions: Iterable) -> Iterator:
+        for motion in motions:
+            energy, _ = self.motion_controller.plan_motion(motion)
+            if not self.energy_supplier.has_enough(energy):
+                raise ValueError("Not enough energy")
+            yield motion
+
     def is_moving(self):
         return self.status == Robot.STATUS_MOVING
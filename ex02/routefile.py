@@ -0,0 +1,169 @@
+"""
+Module for route files: positions stored as a .npy array of shape (n, 2) and float64 dtype.
+Files are memory mapped, routes are planned from the mapped buffer without parsing.
+"""
+import ast
+import mmap
+import struct
+import sys
+from array import array
+from itertools import islice
+from typing import Iterable, Iterator, List
+
+from ex02.geometry import Point, PointArray
+
+MAGIC = b'\x93NUMPY'
+# header lengths of .npy versions 1, 2 and 3
+_HEADER_LENGTHS = {1: struct.Struct('<H'), 2: struct.Struct('<I'), 3: struct.Struct('<I')}
+# room left in saved headers for the number of positions, written once they are all saved
+_SAVED_HEADER_SIZE = 128
+
+
+class RouteFile:
+    """
+    Memory mapped route file. Positions are read in chunks of CHUNK_SIZE points,
+    so routes of any size are planned in constant memory.
+    PointArrays given by points and iter_chunks view the mapped file: they must not be used once it is closed.
+    """
+    CHUNK_SIZE = 65536
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f'Invalid route file {path}: empty file')
+        try:
+            offset, size, self._swap = self._parse_header(self._mmap)
+            if offset + 16 * size > len(self._mmap):
+                raise ValueError('truncated positions')
+        except ValueError as e:
+            self.close()
+            raise ValueError(f'Invalid route file {path}: {e}')
+        self._view = memoryview(self._mmap)[offset:offset + 16 * size]
+        self._size = size
+
+    @staticmethod
+    def _parse_header(buffer):
+        """
+        :param buffer: file content
+        :return: (offset of positions, nb of positions, True if positions are big-endian)
+        """
+        if buffer[:len(MAGIC)] != MAGIC or len(buffer) < len(MAGIC) + 2:
+            raise ValueError('not a .npy file')
+        version = buffer[len(MAGIC)]
+        length_format = _HEADER_LENGTHS.get(version)
+        if length_format is None:
+            raise ValueError(f'unsupported .npy version {version}')
+        start = len(MAGIC) + 2 + length_format.size
+        try:
+            (length,) = length_format.unpack_from(buffer, len(MAGIC) + 2)
+            header = ast.literal_eval(buffer[start:start + length].decode('latin1'))
+        except (struct.error, SyntaxError, ValueError) as e:
+            raise ValueError(f'invalid header: {e}')
+        if not isinstance(header, dict):
+            raise ValueError('invalid header')
+        if header.get('descr') not in ('<f8', '>f8') or header.get('fortran_order'):
+            raise ValueError(f"positions must be C ordered float64, not {header.get('descr')}")
+        shape = header.get('shape')
+        if not (isinstance(shape, tuple) and len(shape) == 2 and shape[1] == 2):
+            raise ValueError(f'positions must have a (n, 2) shape, not {shape}')
+        swap = (header['descr'] == '>f8') != (sys.byteorder == 'big')
+        return start + length, shape[0], swap
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def points(self) -> PointArray:
+        """
+        :return: all positions, viewing the mapped file when its byte order is native
+        """
+        return self._chunk(0, self._size)
+
+    def _chunk(self, start, stop) -> PointArray:
+        view = self._view[16 * start:16 * stop]
+        if not self._swap:
+            return PointArray(view.cast('d'))
+        coordinates = array('d', view.tobytes())
+        coordinates.byteswap()
+        return PointArray(coordinates)
+
+    def iter_chunks(self, chunk_size: int = None) -> Iterator[PointArray]:
+        """
+        :param chunk_size: nb of positions by chunk, CHUNK_SIZE by default
+        :return: PointArray iterator
+        """
+        chunk_size = chunk_size or self.CHUNK_SIZE
+        for start in range(0, self._size, chunk_size):
+            yield self._chunk(start, min(start + chunk_size, self._size))
+
+    def iter_points(self) -> Iterator[Point]:
+        for chunk in self.iter_chunks():
+            yield from chunk.iter_points()
+
+    def to_points(self) -> List[Point]:
+        return self.points.to_points()
+
+    def __iter__(self):
+        return self.iter_points()
+
+    def close(self):
+        """
+        Unmaps file. Raises BufferError while PointArrays viewing it are still referenced.
+        """
+        view = getattr(self, '_view', None)
+        if view is not None:
+            view.release()
+        self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            self.close()
+        except BufferError:
+            # views may be held by the traceback of exc, which is more useful than this error
+            if exc_type is None:
+                raise
+
+    def __repr__(self):
+        return f'route({self.path}, {self._size} positions)'
+
+
+def save_route(path, positions: Iterable, chunk_size: int = RouteFile.CHUNK_SIZE) -> int:
+    """
+    Saves positions as a route file, readable by numpy.load too.
+    Positions are consumed by chunks, any iterable can be saved in constant memory.
+    :param path: file path
+    :param positions: iterable of (x, y) positions, or a PointArray
+    :param chunk_size: nb of positions written at once
+    :return: nb of saved positions
+    """
+    if isinstance(positions, PointArray):
+        positions = positions.iter_points()
+    positions = iter(positions)
+    size = 0
+    with open(path, 'wb') as f:
+        f.write(_header(0))
+        while True:
+            chunk = PointArray.new(islice(positions, chunk_size)).coordinates
+            if not chunk:
+                break
+            if sys.byteorder != 'little':
+                chunk.byteswap()
+            chunk.tofile(f)
+            size += len(chunk) // 2
+        f.seek(0)
+        f.write(_header(size))
+    return size
+
+
+def _header(size: int) -> bytes:
+    header = repr({'descr': '<f8', 'fortran_order': False, 'shape': (size, 2)}).encode('latin1')
+    padding = _SAVED_HEADER_SIZE - len(MAGIC) - 4 - len(header) - 1
+    return MAGIC + bytes((1, 0)) + struct.pack('<H', len(header) + padding + 1) + header + b' ' * padding + b'\n'
@@ -0,0 +1,222 @@
+"""
+Module for simulating robot missions in virtual time, as discrete events
+"""
+import heapq
+import math
+from array import array
+from itertools import count
+from typing import Iterable
+
+from ex02.geometry import Point
+from ex02.motion import Translation
+from ex02.robot import Wheel, EnergySupplier, MotionController, Transmitter, Navigator, Arranger, Robot
+
+
+class VirtualClock:
+    """
+    Simulated time, moved forward by the event scheduler only
+    """
+
+    def __init__(self, start: float = 0.):
+        self.now = start
+
+
+class EventScheduler:
+    """
+    Runs callbacks in virtual time order. Events scheduled at the same time run in scheduling order.
+    """
+
+    def __init__(self, clock: VirtualClock = None):
+        self.clock = clock if clock is not None else VirtualClock()
+        self._events = []
+        self._sequence = count()
+
+    def schedule(self, delay: float, callback, *args):
+        """
+        Schedules callback(*args) in delay time units
+        :param delay: delay from now, positive or zero
+        :param callback:
+        :param args: callback arguments
+        :return:
+        """
+        if delay < 0:
+            raise ValueError(f"Event can not be scheduled in the past: {delay}")
+        heapq.heappush(self._events, (self.clock.now + delay, next(self._sequence), callback, args))
+
+    def run(self, until: float = None) -> int:
+        """
+        Runs events in time order, all of them or up to until. Clock is then moved to until.
+        :param until: optional end time
+        :return: number of events run
+        """
+        events = self._events
+        clock = self.clock
+        nb_events = 0
+        while events and (until is None or events[0][0] <= until):
+            time, _, callback, args = heapq.heappop(events)
+            clock.now = time
+            callback(*args)
+            nb_events += 1
+        if until is not None and until > clock.now:
+            clock.now = until
+        return nb_events
+
+    def __len__(self):
+        return len(self._events)
+
+
+class SimulatedWheel(Wheel):
+    """
+    Wheel keeping its odometer: signed travelled length, and whole distance
+    """
+
+    def __init__(self):
+        self.odometer = 0.
+        self.distance = 0.
+
+    def run(self, length):
+        self.odometer += length
+        self.distance += math.fabs(length)
+
+    def run_profile(self, lengths):
+        self.odometer += math.fsum(lengths)
+        self.distance += math.fsum(map(math.fabs, lengths))
+
+
+class LedgerEnergySupplier(EnergySupplier):
+    """
+    Energy supplier keeping a time stamped ledger of its level
+    """
+
+    def __init__(self, quantity: float = 1000.0, clock: VirtualClock = None):
+        super().__init__(quantity)
+        self.clock = clock if clock is not None else VirtualClock()
+        self.times = array('d', [self.clock.now])
+        self.levels = array('d', [quantity])
+
+    def consume(self, quantity: float) -> float:
+        super().consume(quantity)
+        self.times.append(self.clock.now)
+        self.levels.append(self.quantity)
+
+
+class SimulatedMotionController(MotionController):
+    """
+    Motion controller moving in virtual time: each motion is one event, ending after its planned duration.
+    Wheels run the whole motion lengths at once, and energy is settled at the end of the motion.
+    Poses (time, x, y, heading) are traced at motion boundaries.
+    """
+
+    def __init__(self, right_wheel: Wheel, left_wheel: Wheel, configuration, scheduler: EventScheduler):
+        super().__init__(right_wheel, left_wheel, configuration)
+        self.scheduler = scheduler
+        self.times = array('d')
+        self.xs = array('d')
+        self.ys = array('d')
+        self.headings = array('d')
+
+    def _move(self, motion, energy_supplier):
+        energy, duration = self.plan_motion(motion)
+        right_length, left_length = self._motion_lengths(motion)
+        if not self.times:
+            self._trace(*self._start_pose(motion))
+        scheduler = self.scheduler
+        scheduler.schedule(duration, self._end_motion, motion, right_length, left_length, energy, energy_supplier)
+        scheduler.run(until=scheduler.clock.now + duration)
+        # whole motion lengths are run as one step
+        return 1
+
+    def _end_motion(self, motion, right_length, left_length, energy, energy_supplier):
+        self.right_wheel.run(right_length)
+        self.left_wheel.run(left_length)
+        energy_supplier.consume(energy)
+        self._trace(*self._end_pose(motion))
+
+    def _trace(self, point: Point, vector: Point):
+        self.times.append(self.scheduler.clock.now)
+        self.xs.append(point.x)
+        self.ys.append(point.y)
+        self.headings.append(math.atan2(vector.y, vector.x))
+
+    @staticmethod
+    def _start_pose(motion):
+        if isinstance(motion, Translation):
+            return motion.start, motion.vector
+        return motion.arc.start, motion.arc.start_tangent
+
+    @staticmethod
+    def _end_pose(motion):
+        if isinstance(motion, Translation):
+            return motion.end, motion.vector
+        return motion.arc.end, motion.arc.end_tangent
+
+
+class SimulationReport:
+    """
+    Simulated duration, pose trace and energy curve of a simulator
+    """
+    __slots__ = ('duration', 'times', 'xs', 'ys', 'headings', 'energy_times', 'energy_levels')
+
+    def __init__(self, duration, times, xs, ys, headings, energy_times, energy_levels):
+        self.duration = duration
+        self.times = times
+        self.xs = xs
+        self.ys = ys
+        self.headings = headings
+        self.energy_times = energy_times
+        self.energy_levels = energy_levels
+
+    @property
+    def consumed_energy(self) -> float:
+        return self.energy_levels[0] - self.energy_levels[-1]
+
+    def __repr__(self):
+        return f'simulation(duration={self.duration}, poses={len(self.times)}, energy={self.consumed_energy})'
+
+
+class Simulator:
+    """
+    Robot made of simulated components, running missions in virtual time.
+    Other events can be scheduled on the scheduler, they run while the robot moves.
+    Reported duration ends with the last mission, not with the events run after it.
+    """
+
+    def __init__(self, configuration=None, arranger: Arranger = None, quantity: float = 1000.0):
+        self.scheduler = EventScheduler()
+        self.robot = Robot(transmitter=Transmitter(),
+                           motion_controller=SimulatedMotionController(SimulatedWheel(), SimulatedWheel(),
+                                                                       configuration or {}, self.scheduler),
+                           navigator=Navigator(arranger=arranger or Arranger()),
+                           energy_supplier=LedgerEnergySupplier(quantity, self.scheduler.clock))
+        self.mission_end = self.clock.now
+
+    @property
+    def clock(self) -> VirtualClock:
+        return self.scheduler.clock
+
+    def run(self, motions: Iterable = None) -> SimulationReport:
+        """
+        Runs a mission: loaded motions, or the given motions, then remaining events
+        :param motions: optional motion iterable
+        :return: report since simulator creation
+        """
+        self.robot.run(motions)
+        self.mission_end = self.clock.now
+        self.scheduler.run()
+        return self.report()
+
+    def run_positions(self, positions: Iterable) -> SimulationReport:
+        self.robot.run_positions(positions)
+        self.mission_end = self.clock.now
+        self.scheduler.run()
+        return self.report()
+
+    def report(self) -> SimulationReport:
+        """
+        :return: report since simulator creation, holding copies of the traces
+        """
+        ctrl = self.robot.motion_controller
+        energy_supplier = self.robot.energy_supplier
+        return SimulationReport(duration=self.mission_end,
+                                times=ctrl.times[:], xs=ctrl.xs[:], ys=ctrl.ys[:], headings=ctrl.headings[:],
+                                energy_times=energy_supplier.times[:], energy_levels=energy_supplier.levels[:])
@@ -0,0 +1,43 @@
+"""
+Module for low overhead counters and timers of robot components
+"""
+from time import perf_counter
+
+
+class Stats:
+    """
+    Named counters and timers.
+    Components hold None instead of a Stats instance when instrumentation is disabled.
+    """
+
+    clock = staticmethod(perf_counter)
+
+    def __init__(self):
+        self.counters = {}
+        # name -> [count, total, max]
+        self.timers = {}
+
+    def incr(self, name: str, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def add_time(self, name: str, seconds: float):
+        timer = self.timers.get(name)
+        if timer is None:
+            self.timers[name] = [1, seconds, seconds]
+        else:
+            timer[0] += 1
+            timer[1] += seconds
+            if seconds > timer[2]:
+                timer[2] = seconds
+
+    def reset(self):
+        self.counters.clear()
+        self.timers.clear()
+
+    def snapshot(self) -> dict:
+        """
+        :return: a copy of counters and timers, as plain dictionaries
+        """
+        return {'counters': dict(self.counters),
+                'timers': {name: {'count': count, 'total': total, 'max': max_, 'mean': total / count}
+                           for name, (count, total, max_) in self.timers.items()}}
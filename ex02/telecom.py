@@ -1,6 +1,12 @@
+import json
+import struct
+import sys
 from abc import ABC, abstractmethod
+from array import array
 from enum import (Enum)
-from typing import Dict
+from typing import Dict, Iterable, List
+
+from ex02.geometry import PointArray
 
 
 class Command(Enum):
@@ -15,19 +21,162 @@ class Command(Enum):
     MOVE = 'move'
     MOVED = 'moved'
     INVALID = 'invalid'
+    STATS = 'stats'
+
+
+_COMMANDS = list(Command)
+_COMMAND_CODES = {command: code for code, command in enumerate(_COMMANDS)}
+
+
+def register_commands(commands: Iterable[Enum]):
+    """
+    Registers plugin commands, giving them the next free wire codes.
+    Codes depend on registration order, which has to be the same on both sides.
+    :param commands: commands, e.g. a plugin Enum
+    :return:
+    """
+    for command in commands:
+        if command not in _COMMAND_CODES:
+            _COMMAND_CODES[command] = len(_COMMANDS)
+            _COMMANDS.append(command)
 
 
 class Telecom(object):
+    """
+    Telecom, with its binary wire format:
+    header (command code, nb of positions, nb of errors, document length), positions as
+    little-endian float64 (x, y) pairs, errors as length prefixed utf-8, then a dict payload
+    as a utf-8 JSON document.
+    """
+    HEADER = struct.Struct('<HIII')
+    ERROR_LENGTH = struct.Struct('<I')
 
-    def __init__(self, command: Command, payload=None, errors=None):
-        assert isinstance(command, Command)
+    def __init__(self, command: Enum, payload=None, errors=None):
+        assert isinstance(command, Enum)
         self.command = command
         self.payload = payload
         self.errors= errors
 
+    def encode(self) -> bytes:
+        """
+        Encodes telecom in its binary format. Payload has to be positions, a JSON serializable dict, or None.
+        :return: bytes
+        """
+        document = self._encode_document()
+        coordinates = self._encode_payload() if not document else array('d')
+        errors = [e.encode('utf-8') for e in self.errors or ()]
+        code = _COMMAND_CODES.get(self.command)
+        if code is None:
+            raise ValueError(f'Command {self.command} is not registered')
+        parts = [Telecom.HEADER.pack(code, len(coordinates) // 2, len(errors), len(document)),
+                 coordinates.tobytes()]
+        for error in errors:
+            parts.append(Telecom.ERROR_LENGTH.pack(len(error)))
+            parts.append(error)
+        parts.append(document)
+        return b''.join(parts)
+
+    def _encode_document(self) -> bytes:
+        if not isinstance(self.payload, dict):
+            return b''
+        try:
+            return json.dumps(self.payload, separators=(',', ':')).encode('utf-8')
+        except (TypeError, ValueError) as e:
+            raise ValueError(f'Payload can not be encoded: {e}')
+
+    def _encode_payload(self) -> array:
+        if not self.payload:
+            return array('d')
+        try:
+            positions = self.payload if isinstance(self.payload, PointArray) else PointArray.new(self.payload)
+        except (TypeError, IndexError, ValueError) as e:
+            raise ValueError(f'Payload can not be encoded: {e}')
+        coordinates = array('d', positions.coordinates)
+        if sys.byteorder != 'little':
+            coordinates.byteswap()
+        return coordinates
+
+    @classmethod
+    def decode(cls, buffer) -> 'Telecom':
+        """
+        Decodes a telecom from a bytes-like buffer.
+        Positions are returned as a PointArray viewing the buffer, without copy.
+        :param buffer: bytes-like object
+        :return: Telecom
+        """
+        view = memoryview(buffer).cast('B')
+        try:
+            code, nb_positions, nb_errors, document_length = Telecom.HEADER.unpack_from(view)
+            command = _COMMANDS[code]
+        except (struct.error, IndexError) as e:
+            raise ValueError(f'Invalid telecom: {e}')
+
+        offset = Telecom.HEADER.size
+        end = offset + 16 * nb_positions
+        if end > len(view):
+            raise ValueError('Invalid telecom: truncated payload')
+        payload = None
+        if nb_positions:
+            payload = PointArray(cls._decode_coordinates(view[offset:end]))
+
+        errors = None
+        offset = end
+        if nb_errors:
+            errors = []
+            try:
+                for _ in range(nb_errors):
+                    (length,) = Telecom.ERROR_LENGTH.unpack_from(view, offset)
+                    offset += Telecom.ERROR_LENGTH.size
+                    if offset + length > len(view):
+                        raise ValueError('Invalid telecom: truncated errors')
+                    errors.append(str(view[offset:offset + length], 'utf-8'))
+                    offset += length
+            except (struct.error, UnicodeDecodeError) as e:
+                raise ValueError(f'Invalid telecom: {e}')
+
+        if document_length:
+            if offset + document_length > len(view):
+                raise ValueError('Invalid telecom: truncated document')
+            try:
+                payload = json.loads(str(view[offset:offset + document_length], 'utf-8'))
+            except ValueError as e:
+                raise ValueError(f'Invalid telecom: {e}')
+
+        return cls(command=command, payload=payload, errors=errors)
+
+    @staticmethod
+    def _decode_coordinates(view):
+        if sys.byteorder == 'little':
+            return view.cast('d')
+        coordinates = array('d', view.tobytes())
+        coordinates.byteswap()
+        return coordinates
+
 
 class Exchanger(ABC):
 
     @abstractmethod
     def exchange(self, tm: Telecom) -> Telecom:
         pass
+
+    def exchange_many(self, tms: Iterable[Telecom]) -> List[Telecom]:
+        """
+        Exchanges a batch of telecoms
+        :param tms: telecoms, processed in order
+        :return: responses, in the same order
+        """
+        return [self.exchange(tm) for tm in tms]
+
+
+class AsyncExchanger(ABC):
+    """
+    Exchanger awaited from an event loop. Its methods are named apart from the Exchanger ones,
+    so that a class can be both.
+    """
+
+    @abstractmethod
+    async def exchange_async(self, tm: Telecom) -> Telecom:
+        pass
+
+    async def exchange_many_async(self, tms: Iterable[Telecom]) -> List[Telecom]:
+        return [await self.exchange_async(tm) for tm in tms]
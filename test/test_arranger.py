@@ -17,6 +17,22 @@ class TestBaseArranger:
         assert len(result) == len(motions) + 1
         assert isinstance(result[1], Rotation)
 
+    def test_long_route_uses_arc_batch(self, mocker):
+        # --given--
+        points = [Point(x, (x % 3) * (x % 2)) for x in range(Arranger.BATCH_SIZE + 2)]
+        motions = [Translation(a, b) for a, b in zip(points, points[1:])]
+        arranger = Arranger()
+        expected = [motion for idx, current in enumerate(motions)
+                    for motion in ((Rotation.new_from_translations(motions[idx - 1], current), current)
+                                   if idx and not motions[idx - 1].is_parallel_with(current) else (current,))]
+        spy = mocker.spy(Arranger, '_arrange_batch')
+        # --when--
+        result = arranger.arrange(motions)
+        # --then--
+        assert spy.call_count == 1
+        assert result == expected
+        assert list(arranger.iter_arrange(motions)) == expected
+
 def is_rotation(r):
     return isinstance(r, Rotation)
 
@@ -78,3 +94,23 @@ class TestCurveArranger:
 
         assert on_the_spot_positions == indices_on_spot
         assert simple_rotation_positions == indices_simple
+
+    def test_less_than_3_motions_uses_base_arranger(self):
+        motions = self.__class__.to_translation([Point(0, 0), Point(10, 0), Point(10, 10)])
+
+        arranged_motions = CurveArranger().arrange(motions)
+
+        assert arranged_motions == Arranger().arrange(motions)
+
+    def test_long_route_keeps_pattern(self):
+        pattern = [(0,0), (1,5),(3,7),(5,5)]
+        points = [(x + 10 * k, y) for k in range(50) for x, y in pattern]
+        motions = self.__class__.to_translation(list(Point.new(xy) for xy in points))
+
+        arranged_motions = CurveArranger().arrange(motions)
+
+        assert arranged_motions[0] is motions[0]
+        assert arranged_motions[-1] is motions[-1]
+        assert not any(is_rotation(m) and is_rotation(n)
+                       for m, n in zip(arranged_motions, arranged_motions[1:]))
+        assert len(get_simple_rotations_indices(arranged_motions)) == 50
@@ -0,0 +1,126 @@
+import threading
+
+import pytest
+
+from ex02.drive import BufferedWheel, MemoryDriver, WheelDriver
+from ex02.geometry import Point
+from ex02.motion import Translation
+from ex02.robot import MotionController, EnergySupplier, Wheel
+
+
+class TestBufferedWheel:
+
+    def test_flush_at_watermark(self):
+        # --given--
+        driver = MemoryDriver()
+        wheel = BufferedWheel(driver, capacity=8, watermark=4)
+        # --when--
+        for length in range(6):
+            wheel.run(float(length))
+        # --then--
+        assert list(driver.lengths) == [0, 1, 2, 3]
+        assert len(wheel) == 2
+        wheel.end_motion()
+        assert list(driver.lengths) == [0, 1, 2, 3, 4, 5]
+        assert len(wheel) == 0
+        assert wheel.stats.counters['flushed'] == 6
+        assert wheel.stats.timers['flush'][0] == 2
+
+    def test_run_profile_wraps_around(self):
+        driver = MemoryDriver()
+        wheel = BufferedWheel(driver, capacity=5, watermark=3)
+        wheel.run(-1.)
+        wheel.run(-2.)
+        wheel.run_profile([float(x) for x in range(12)])
+        wheel.end_motion()
+        assert list(driver.lengths) == [-1, -2] + list(range(12))
+        assert 'overruns' not in wheel.stats.counters
+
+    def test_partial_writes(self):
+        driver = MemoryDriver(max_batch=1)
+        wheel = BufferedWheel(driver, capacity=4, watermark=2)
+        wheel.run_profile([float(x) for x in range(10)])
+        wheel.end_motion()
+        assert list(driver.lengths) == list(range(10))
+
+    def test_overrun_when_driver_is_busy(self):
+        # --given--
+        class BusyDriver(MemoryDriver):
+            calls = 0
+
+            def write(self, lengths):
+                self.calls += 1
+                if self.calls % 2 == 0:
+                    return super().write(lengths)
+                # room is freed later, by the driver thread
+                threading.Timer(0.01, self.notify_ready).start()
+                return 0
+
+        driver = BusyDriver()
+        wheel = BufferedWheel(driver, capacity=4, watermark=4)
+        # --when--
+        wheel.run_profile([float(x) for x in range(10)])
+        wheel.end_motion()
+        # --then--
+        assert list(driver.lengths) == list(range(10))
+        assert wheel.stats.counters['overruns'] > 0
+
+    def test_stuck_driver(self):
+        class StuckDriver(WheelDriver):
+            def write(self, lengths):
+                return 0
+
+        wheel = BufferedWheel(StuckDriver(), capacity=4, watermark=4, timeout=0.01)
+        wheel.run_profile([1., 2., 3.])
+        with pytest.raises(BufferError):
+            wheel.end_motion()
+
+    def test_driver_must_write(self):
+        with pytest.raises(TypeError):
+            WheelDriver()
+
+    @pytest.mark.parametrize('capacity, watermark', [(0, None), (4, 0), (4, 5)])
+    def test_invalid_parameters(self, capacity, watermark):
+        with pytest.raises(ValueError):
+            BufferedWheel(MemoryDriver(), capacity=capacity, watermark=watermark)
+
+
+class TestMotionControllerWithBufferedWheels:
+
+    @pytest.mark.parametrize('configuration', [{}, {'batched': True}, {'profile': 'trapezoidal'}])
+    def test_motion_is_flushed_at_its_end(self, configuration):
+        # --given--
+        right_driver, left_driver = MemoryDriver(), MemoryDriver()
+        ctrl = MotionController(right_wheel=BufferedWheel(right_driver, capacity=64),
+                                left_wheel=BufferedWheel(left_driver, capacity=64),
+                                configuration=configuration)
+        motion = Translation(Point(0, 0), Point(10, 0))
+        profile = ctrl.compute_profile(motion)
+        # --when--
+        ctrl.move(motion, EnergySupplier())
+        # --then--
+        assert right_driver.lengths == profile.right
+        assert left_driver.lengths == profile.left
+        assert len(ctrl.right_wheel) == 0
+
+    def test_end_motion_hook(self, mocker):
+        right_wheel, left_wheel = mocker.Mock(spec=Wheel), mocker.Mock(spec=Wheel)
+        ctrl = MotionController(right_wheel=right_wheel, left_wheel=left_wheel, configuration={})
+        ctrl.move(Translation(Point(0, 0), Point(1, 0)), EnergySupplier())
+        right_wheel.end_motion.assert_called_once_with()
+        left_wheel.end_motion.assert_called_once_with()
+
+    def test_steps_are_flushed_when_motion_fails(self, mocker):
+        # --given--
+        right_driver, left_driver = MemoryDriver(), MemoryDriver()
+        ctrl = MotionController(right_wheel=BufferedWheel(right_driver, capacity=64),
+                                left_wheel=BufferedWheel(left_driver, capacity=64),
+                                configuration={})
+        energy_supplier = EnergySupplier()
+        mocker.patch.object(energy_supplier, 'consume', side_effect=[None, None, ValueError('empty')])
+        # --when--
+        with pytest.raises(ValueError):
+            ctrl.move(Translation(Point(0, 0), Point(10, 0)), energy_supplier)
+        # --then--
+        assert len(right_driver.lengths) == 3
+        assert len(ctrl.right_wheel) == 0
@@ -0,0 +1,70 @@
+import pickle
+
+import pytest
+
+from ex02.fleet import FleetPlanner, plan_job
+from ex02.geometry import PointArray
+from ex02.motion import pack_motions, unpack_motions
+from ex02.robot import Navigator, Arranger, CurveArranger
+
+ROUTES = {
+    'r0': [(0,0), (0,5),(1,8),(3,9),(5,8), (7,5), (6,0),(0,0)],
+    'r1': [(0,0), (1,5),(3,7),(5,5),(6,0)],
+    'r2': [(0,0), (10, 0), (10, 10)],
+}
+
+
+def jobs(arranger):
+    return [(robot_id, positions, arranger) for robot_id, positions in ROUTES.items()]
+
+
+class TestPackMotions:
+
+    @pytest.mark.parametrize('arranger', [Arranger(), CurveArranger()])
+    def test_round_trip(self, arranger):
+        motions = Navigator(arranger=arranger).compute_motions(ROUTES['r0'])
+        unpacked = unpack_motions(pack_motions(motions))
+        assert [type(m) for m in unpacked] == [type(m) for m in motions]
+        assert unpacked == motions
+        assert [m.get_length() for m in unpacked] == [m.get_length() for m in motions]
+        assert [m.arc.direction for m in unpacked if hasattr(m, 'arc')] == \
+               [m.arc.direction for m in motions if hasattr(m, 'arc')]
+
+    def test_unknown_motion(self):
+        with pytest.raises(ValueError):
+            pack_motions(['foo'])
+
+
+class TestFleetPlanner:
+
+    @pytest.mark.parametrize('arranger', [Arranger(), CurveArranger()])
+    def test_serial_plans(self, arranger):
+        plans = FleetPlanner(processes=0).plan(jobs(arranger))
+        assert [p.robot_id for p in plans] == list(ROUTES)
+        for plan, positions in zip(plans, ROUTES.values()):
+            assert plan.motions() == Navigator(arranger=arranger).compute_motions(positions)
+
+    def test_pool_gives_same_output_as_serial(self):
+        serial = FleetPlanner(processes=0).plan(jobs(CurveArranger()) * 3)
+        with FleetPlanner(processes=2, chunksize=2) as planner:
+            parallel = planner.plan(jobs(CurveArranger()) * 3)
+        assert parallel == serial
+
+    @pytest.mark.parametrize('processes, chunksize, expected', [(2, None, 10), (2, 3, 3), (100, None, 1)])
+    def test_chunksize(self, processes, chunksize, expected):
+        assert FleetPlanner(processes=processes, chunksize=chunksize)._get_chunksize(80) == expected
+
+    def test_invalid_route_does_not_stop_fleet(self):
+        plans = FleetPlanner(processes=0).plan([('bad', [], None), ('r2', ROUTES['r2'], None)])
+        assert not plans[0].is_valid()
+        with pytest.raises(ValueError):
+            plans[0].motions()
+        assert plans[1].is_valid()
+
+    def test_point_array_positions(self):
+        plan = plan_job(('r1', PointArray.new(ROUTES['r1']), Arranger()))
+        assert plan == plan_job(('r1', ROUTES['r1'], Arranger()))
+
+    def test_plan_pickles(self):
+        plan = plan_job(('r1', ROUTES['r1'], Arranger()))
+        assert pickle.loads(pickle.dumps(plan)) == plan
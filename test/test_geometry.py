@@ -1,6 +1,9 @@
+import pickle
 import pytest
 import math
-from ex02.geometry import Point, Line, Arc, Geometry
+import sys
+import threading
+from ex02.geometry import Point, PointArray, Line, Arc, ArcBatch, Geometry, LRUCache
 
 NORTH = Point(0, 1)
 SOUTH = Point(0, -1)
@@ -295,6 +298,43 @@ class TestGeometry:
         assert Geometry.is_beyond_point(candidate, point, vector) == expected
 
 
+class TestSimplify:
+
+    @staticmethod
+    def points(positions):
+        return [Point.new(xy) for xy in positions]
+
+    @pytest.mark.parametrize('simplify', [Geometry.simplify, lambda p, t: list(Geometry.iter_simplify(p, t))])
+    @pytest.mark.parametrize('positions, expected', [
+        ([(0, 0), (1, 0.001), (2, -0.001), (3, 0), (3, 5)], [(0, 0), (3, 0), (3, 5)]),
+        ([(0, 0), (1, 1), (2, 2), (3, 3)], [(0, 0), (3, 3)]),
+        ([(0, 0), (5, 0), (5, 5), (0, 5), (0, 0)], [(0, 0), (5, 0), (5, 5), (0, 5), (0, 0)]),
+        ([(0, 0), (0, 0), (5, 0)], [(0, 0), (5, 0)]),
+        ([(0, 0), (1, 0)], [(0, 0), (1, 0)]),
+        ([(0, 0)], [(0, 0)]),
+    ])
+    def test_simplify(self, simplify, positions, expected):
+        assert simplify(self.points(positions), 0.01) == self.points(expected)
+
+    def test_iter_simplify_keeps_u_turns(self):
+        positions = [(0, 0), (5, 0), (10, 0), (5, 0), (0, 0)]
+        assert list(Geometry.iter_simplify(self.points(positions), 0.01)) == self.points([(0, 0), (10, 0), (0, 0)])
+
+    def test_simplify_keeps_points_away_from_path(self):
+        points = self.points([(0, 0), (5, 0.5), (10, 0)])
+        assert Geometry.simplify(points, 0.1) == points
+        assert Geometry.simplify(points, 1.) == [points[0], points[-1]]
+
+    def test_iter_simplify_is_lazy(self):
+        def source():
+            yield Point(0, 0)
+            yield Point(5, 0)
+            yield Point(5, 5)
+            raise AssertionError('consumed too far')
+
+        assert next(Geometry.iter_simplify(source(), 0.1)) == Point(0, 0)
+
+
 class ProofOfConcepts:
 
     def test_find_angle_from_tangents_and_points(self):
@@ -322,3 +362,273 @@ class ProofOfConcepts:
 
 
 
+
+
+class TestPointArray:
+
+    @pytest.fixture()
+    def points(self):
+        return [Point(1, 0), Point(0.5, 2), Point(-3, 4)]
+
+    def test_round_trip(self, points):
+        array_ = PointArray.from_points(points)
+        assert len(array_) == 3
+        assert array_.to_points() == points
+        assert array_[-1] == Point(-3, 4)
+
+    def test_new_from_tuples(self):
+        array_ = PointArray.new([(1, 2), (3, 4)])
+        assert list(array_.xs) == [1., 3.]
+        assert list(array_.ys) == [2., 4.]
+
+    def test_odd_coordinates(self):
+        with pytest.raises(ValueError):
+            PointArray([1., 2., 3.])
+
+    @pytest.mark.parametrize("operation", [
+        lambda a, b: a + b,
+        lambda a, b: a - b,
+        lambda a, b: a * 2.5,
+        lambda a, b: a.normal(),
+        lambda a, b: a.reverse(),
+        lambda a, b: a.normalize(),
+    ])
+    def test_same_semantics_as_point(self, points, operation):
+        a = PointArray.from_points(points)
+        b = PointArray.from_points(list(reversed(points)))
+        expected = [operation(p, q) for p, q in zip(points, reversed(points))]
+        assert operation(a, b).to_points() == expected
+
+    def test_broadcast_point(self, points):
+        a = PointArray.from_points(points)
+        assert (a + EAST).to_points() == [p + EAST for p in points]
+
+    def test_products_and_distance(self, points):
+        a = PointArray.from_points(points)
+        b = PointArray.from_points(list(reversed(points)))
+        pairs = list(zip(points, reversed(points)))
+        assert list(a.scalar_product(b)) == [p.scalar_product(q) for p, q in pairs]
+        assert list(a.vectorial_product(b)) == [p.vectorial_product(q) for p, q in pairs]
+        assert list(PointArray.distance(a, b)) == [Point.distance(p, q) for p, q in pairs]
+        assert list(PointArray.distance(a)) == [Point.distance(p) for p in points]
+
+    def test_different_lengths(self, points):
+        with pytest.raises(ValueError):
+            PointArray.from_points(points) + PointArray.from_points(points[:1])
+
+
+class TestValueTypes:
+
+    def test_point_is_immutable(self):
+        a = Point(1, 2)
+        with pytest.raises(AttributeError):
+            a.x = 3
+        with pytest.raises(AttributeError):
+            a.z = 3
+
+    def test_point_has_no_dict(self):
+        assert not hasattr(Point(1, 2), '__dict__')
+
+    def test_point_is_hashable(self):
+        assert len({Point(1, 2), Point(1.0, 2.0), Point(2, 1)}) == 2
+
+    def test_points_with_same_rounded_coordinates_have_equal_hashes(self):
+        assert hash(Point(1e-10, -2e-10)) == hash(Point(2e-10, 1e-10))
+        assert hash(Point(0.1 + 0.2, 1)) == hash(Point(0.3, 1))
+
+    @pytest.mark.parametrize('a, b, expected', [
+        (Point(500000.1 + 0.2, 4000000.7 * 3 / 3 + 0.1), Point(500000.3, 4000000.8), True),
+        (Point(1e6, 0), Point(1e6 + 5e-4, 0), True),
+        (Point(1e-10, -2e-10), Point(2e-10, 1e-10), True),
+        (Point(1, 0), Point(1 + 1e-6, 0), False),
+    ])
+    def test_points_are_equal_within_tolerance(self, a, b, expected):
+        assert (a == b) is expected
+
+    def test_arc_is_hashable_value(self):
+        a = Arc(Point(1, 0), Point(0, 1), Point(0, 1))
+        b = Arc(Point(1, 0), Point(0, 1), Point(0, 1))
+        assert a == b
+        assert hash(a) == hash(b)
+        with pytest.raises(AttributeError):
+            a.radius = 2
+
+    def test_pickle(self):
+        a = Arc(Point(1, 0), Point(0, 1), Point(0, 1))
+        assert pickle.loads(pickle.dumps(a)) == a
+        assert pickle.loads(pickle.dumps(Point(1, 2))) == Point(1, 2)
+
+
+class TestLRUCache:
+
+    def test_eviction_of_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        assert cache.get('a') == 1
+        cache.put('c', 3)
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3
+        assert (cache.hits, cache.misses) == (3, 1)
+        assert len(cache) == 2
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            LRUCache(maxsize=0)
+
+    def test_concurrent_access(self):
+        # --given--
+        cache = LRUCache(maxsize=8)
+        errors = []
+
+        def work(seed):
+            try:
+                for i in range(20000):
+                    key = (i * 7 + seed) % 16
+                    if cache.get(key) is None:
+                        cache.put(key, i)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=work, args=(seed,)) for seed in range(8)]
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        # --when--
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(switch_interval)
+        # --then--
+        assert errors == []
+        assert len(cache) == 8
+        assert cache.hits + cache.misses == 8 * 20000
+
+
+class TestLazyArc:
+
+    def test_values_are_computed_once_on_first_access(self, mocker):
+        # --given--
+        spy = mocker.spy(Arc, 'compute_center_from_both_tangents')
+        arc = Arc(Point(1, 0), Point(0, 1), Point(0, 1))
+        assert spy.call_count == 0
+        # --when--
+        radius = arc.radius
+        # --then--
+        assert math.isclose(radius, 1)
+        assert arc.center == Point(0, 0)
+        assert arc.direction == Arc.DIRECT
+        assert spy.call_count == 1
+
+    def test_invalid_arc_raises_on_access(self, mocker):
+        # --given--
+        spy = mocker.spy(Arc, 'compute_center_from_both_tangents')
+        arc = Arc(Point(-5, 2), Point(1, 0), Point(0, 1), Point(1, -1))
+        # --when / then--
+        for _ in range(2):
+            with pytest.raises(AssertionError):
+                arc.length
+        with pytest.raises(AssertionError):
+            arc.radius
+        with pytest.raises(AssertionError):
+            arc.validate()
+        # error is kept, arc is not computed again
+        assert spy.call_count == 1
+
+    def test_unknown_attribute(self):
+        with pytest.raises(AttributeError):
+            Arc(Point(1, 0), Point(0, 1), Point(0, 1)).foo
+
+    def test_validated_arc_is_computed(self, mocker):
+        arc = Arc(Point(1, 0), Point(0, 1), Point(0, 1), validate=True)
+        spy = mocker.spy(Arc, '_compute')
+        assert arc.validate() is arc
+        assert math.isclose(arc.angle, math.pi / 2)
+        spy.assert_not_called()
+
+
+class TestArcCache:
+
+    @pytest.fixture()
+    def cache(self):
+        previous = Arc.cache
+        yield Arc.configure_cache(maxsize=2)
+        Arc.cache = previous
+
+    def test_same_inputs_share_arc(self, cache):
+        a = Arc.new(Point(1, 0), Point(0, 1), Point(0, 1))
+        b = Arc.new(Point(1, 0), Point(0, 1 + 1e-12), Point(0, 1))
+        assert a is b
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_different_inputs(self, cache):
+        a = Arc.new(Point(1, 0), Point(0, 1), Point(0, 1))
+        b = Arc.new(Point(1, 0), Point(0, 1), Point(0, -1))
+        assert a is not b
+        assert b == Arc(Point(1, 0), Point(0, 1), Point(0, -1))
+        assert cache.misses == 2
+
+    def test_errors_are_not_cached(self, cache):
+        for _ in range(2):
+            with pytest.raises(AssertionError):
+                Arc.new(Point(-5, 2), Point(1, 0), Point(0, 1), Point(1, -1), validate=True)
+        assert len(cache) == 0
+
+    def test_invalid_lazy_arc_keeps_its_error(self, cache, mocker):
+        # --given--
+        spy = mocker.spy(Arc, 'compute_center_from_both_tangents')
+        arc = Arc.new(Point(-5, 2), Point(1, 0), Point(0, 1), Point(1, -1))
+        with pytest.raises(AssertionError):
+            arc.length
+        # --when / then--
+        for _ in range(2):
+            with pytest.raises(AssertionError):
+                Arc.new(Point(-5, 2), Point(1, 0), Point(0, 1), Point(1, -1), validate=True)
+        assert spy.call_count == 1
+
+    def test_disabled_cache(self, cache):
+        assert Arc.configure_cache(maxsize=0) is None
+        assert Arc.new(Point(1, 0), Point(0, 1), Point(0, 1)) is not Arc.new(Point(1, 0), Point(0, 1), Point(0, 1))
+
+
+class TestArcBatch:
+
+    CORNERS = [
+        (Point(1, 0), Point(0, 1), Point(0, 1), Point(-1, 0)),
+        (Point(1, 0), Point(0, 1), Point(0, -1), Point(1, 0)),
+        (Point(-1, 0), Point(1, 0), Point(0, 1), Point(0, -1)),
+        (Point(0, 0), Point(0, 0), Point(0, 1), Point(0, -1)),
+        (Point(2, 3), Point(2, 3), Point(1, 0), Point(0, 1)),
+        (Point(0, 5), Point(0, 0), Point(1, -1).normalize(), Point(-1, -1).normalize()),
+    ]
+
+    def test_same_arcs_as_arc(self):
+        # --given--
+        batch = ArcBatch.from_points(*zip(*self.CORNERS))
+        # --when--
+        arcs = batch.arcs()
+        # --then--
+        assert len(batch) == len(self.CORNERS)
+        for arc, corner in zip(arcs, self.CORNERS):
+            expected = Arc(*corner)
+            assert arc == expected
+            assert (arc.center.x, arc.center.y) == (expected.center.x, expected.center.y)
+            assert (arc.radius, arc.angle, arc.direction, arc.length) == \
+                   (expected.radius, expected.angle, expected.direction, expected.length)
+
+    @pytest.mark.parametrize('corner, error', [
+        ((Point(-5, 2), Point(1, 0), Point(0, 1), Point(1, -1)), AssertionError),
+        ((Point(0, 0), Point(1, 0), Point(0, 0), Point(0, 1)), ZeroDivisionError),
+    ])
+    def test_same_errors_as_arc(self, corner, error):
+        with pytest.raises(error):
+            Arc(*corner, validate=True)
+        with pytest.raises(error):
+            ArcBatch.from_points(*zip(self.CORNERS[0], corner))
+
+    def test_different_lengths(self):
+        with pytest.raises(ValueError):
+            ArcBatch.from_points([Point(1, 0)], [], [Point(0, 1)], [Point(-1, 0)])
@@ -1,9 +1,10 @@
 import math
+import threading
 from unittest.mock import call
 
 import pytest
 
-from ex02.robot import Robot, MotionController, Wheel, EnergySupplier
+from ex02.robot import Robot, MotionController, Wheel, EnergySupplier, ConcurrentWheelDrive
 from ex02.motion import Translation, Rotation
 from ex02.geometry import Point
 
@@ -203,3 +204,251 @@ class TestMotionController:
         """Extracts values from mock's call_args_list"""
         args = getattr(mock, param).call_args_list
         return get_values_from_call_list(args)
+
+
+class TestBatchedMotionController:
+
+    @pytest.fixture()
+    def init_controller(self, mocker):
+        right_wheel = mocker.Mock(spec=Wheel)
+        left_wheel = mocker.Mock(spec=Wheel)
+        energy_supplier = mocker.Mock(spec=EnergySupplier)
+        ctrl = MotionController(right_wheel=right_wheel,
+                                left_wheel=left_wheel,
+                                configuration={'batched': True})
+        return ctrl, right_wheel, left_wheel, energy_supplier
+
+    def test_compute_profile_of_translation(self, init_controller):
+        # --given--
+        ctrl, *_ = init_controller
+        tr = Translation(Point(0, 0), Point(10, 0))
+        # --when--
+        profile = ctrl.compute_profile(tr)
+        # --then--
+        assert profile.steps == 1000
+        assert set(profile.right) == set(profile.left) == {0.01}
+        assert profile.energy == pytest.approx(20)
+        assert profile.duration == pytest.approx(100)
+
+    def test_compute_profile_of_rotation(self, init_controller):
+        # --given--
+        ctrl, *_ = init_controller
+        rot = Rotation(start=Point(10, 0), end=Point(0, 10), start_vector=Point(0, 1), end_vector=Point(-1, 0))
+        # --when--
+        profile = ctrl.compute_profile(rot)
+        # --then--
+        assert profile.steps == 1649
+        assert sum(profile.right) == pytest.approx(10.5 * math.pi / 2)
+        assert sum(profile.left) == pytest.approx(9.5 * math.pi / 2)
+        assert profile.energy == pytest.approx(20 * math.pi / 2)
+
+    def test_compute_profile_of_unknown_motion(self, init_controller):
+        ctrl, *_ = init_controller
+        with pytest.raises(ValueError):
+            ctrl.compute_profile('foo')
+
+    @pytest.mark.parametrize('motion', [
+        Translation(Point(0, 0), Point(10, 0)),
+        Rotation(start=Point(1, 0), end=Point(1, 0), start_vector=Point(0, 1), end_vector=Point(-1, 0)),
+        Rotation(start=Point(0, 5), end=Point(0, 0), start_vector=Point(1, -1), end_vector=Point(-1, -1)),
+    ])
+    def test_batched_move(self, motion, init_controller):
+        # --given--
+        ctrl, right_wheel, left_wheel, energy_supplier = init_controller
+        profile = ctrl.compute_profile(motion)
+        # --when--
+        ctrl.move(motion, energy_supplier)
+        # --then--
+        right_wheel.run.assert_not_called()
+        right_wheel.run_profile.assert_called_once_with(profile.right)
+        left_wheel.run_profile.assert_called_once_with(profile.left)
+        energy_supplier.consume.assert_called_once_with(profile.energy)
+
+
+class TestWheel:
+
+    def test_run_profile_runs_each_step(self, mocker):
+        wheel = Wheel()
+        run = mocker.patch.object(wheel, 'run')
+        wheel.run_profile([0.1, 0.2])
+        assert get_values_from_call_list(run.call_args_list) == [0.1, 0.2]
+
+
+class TestMotionPlanning:
+
+    @pytest.fixture()
+    def ctrl(self):
+        return MotionController(right_wheel=Wheel(), left_wheel=Wheel(), configuration={})
+
+    @pytest.mark.parametrize('motion', [
+        Translation(Point(0, 0), Point(10, 0)),
+        Translation(Point(0, 0), Point(0.001, 0)),
+        Rotation(start=Point(1, 0), end=Point(1, 0), start_vector=Point(0, 1), end_vector=Point(-1, 0)),
+        Rotation(start=Point(1, 0), end=Point(1, 0), start_vector=Point(0, 1), end_vector=Point(1, 0)),
+        Rotation(start=Point(10, 0), end=Point(0, 10), start_vector=Point(0, 1), end_vector=Point(-1, 0)),
+        Rotation(start=Point(0, 5), end=Point(0, 0), start_vector=Point(1, -1), end_vector=Point(-1, -1)),
+        Rotation(start=Point(0.2, 0), end=Point(0, 0.2), start_vector=Point(0, 1), end_vector=Point(-1, 0)),
+    ])
+    def test_planned_energy_is_consumed_energy(self, ctrl, motion):
+        # --given--
+        energy_supplier = EnergySupplier(quantity=1000.)
+        # --when--
+        energy, duration = ctrl.plan_motion(motion)
+        ctrl.move(motion, energy_supplier)
+        # --then--
+        assert energy > 0
+        assert 1000. - energy_supplier.quantity == pytest.approx(energy)
+        assert duration == pytest.approx(ctrl.compute_profile(motion).duration)
+
+    @pytest.mark.parametrize('length, expected', [(10, 100), (0.001, 0.1), (0.015, 0.1)])
+    def test_planned_duration_is_run_duration(self, ctrl, length, expected):
+        motion = Translation(Point(0, 0), Point(length, 0))
+        steps = ctrl.compute_profile(motion).right
+        assert ctrl.plan_motion(motion)[1] == pytest.approx(expected)
+        assert ctrl.plan_motion(motion)[1] == pytest.approx(len(steps) * ctrl.time_step)
+
+    def test_totals_for_motions(self, ctrl):
+        motions = [Translation(Point(0, 0), Point(10, 0)), Translation(Point(10, 0), Point(10, 5))]
+        assert ctrl.get_required_energy_for_motions(motions) == pytest.approx(30)
+        assert ctrl.get_duration_for_motions(motions) == pytest.approx(150)
+
+
+class TestTrapezoidalProfile:
+
+    @pytest.fixture()
+    def ctrl(self):
+        return MotionController(right_wheel=Wheel(), left_wheel=Wheel(), configuration={'profile': 'trapezoidal'})
+
+    def test_unknown_profile(self):
+        with pytest.raises(ValueError):
+            MotionController(right_wheel=Wheel(), left_wheel=Wheel(), configuration={'profile': 'foo'})
+
+    def test_long_translation(self, ctrl):
+        # --given--
+        tr = Translation(Point(0, 0), Point(10, 0))
+        # --when--
+        profile = ctrl.compute_profile(tr)
+        # --then--
+        # 1s of acceleration and deceleration by 0.1s steps, 99s of cruise by 1s steps
+        assert profile.steps == 10 + 99 + 10
+        assert sum(profile.right) == sum(profile.left) == pytest.approx(10, abs=1e-12)
+        assert profile.energy == 20
+        assert profile.duration == pytest.approx(101)
+        assert sum(profile.times) == pytest.approx(profile.duration)
+        assert profile.right[0] < profile.right[9] < profile.right[10]
+        assert max(profile.right) == pytest.approx(0.1)
+
+    def test_short_translation_never_cruises(self, ctrl):
+        tr = Translation(Point(0, 0), Point(0.01, 0))
+        profile = ctrl.compute_profile(tr)
+        assert max(profile.times) <= ctrl.time_step
+        assert sum(profile.right) == pytest.approx(0.01)
+        assert profile.duration == pytest.approx(2 * math.sqrt(0.01 / ctrl.acceleration))
+
+    def test_rotation_keeps_wheel_ratio(self, ctrl):
+        rot = Rotation(start=Point(10, 0), end=Point(0, 10), start_vector=Point(0, 1), end_vector=Point(-1, 0))
+        profile = ctrl.compute_profile(rot)
+        assert sum(profile.right) == pytest.approx(10.5 * math.pi / 2)
+        assert sum(profile.left) == pytest.approx(9.5 * math.pi / 2)
+        for right, left in zip(profile.right, profile.left):
+            assert left == pytest.approx(right * 9.5 / 10.5)
+
+    @pytest.mark.parametrize('batched', [False, True])
+    @pytest.mark.parametrize('motion', [
+        Translation(Point(0, 0), Point(10, 0)),
+        Rotation(start=Point(1, 0), end=Point(1, 0), start_vector=Point(0, 1), end_vector=Point(-1, 0)),
+        Rotation(start=Point(0, 5), end=Point(0, 0), start_vector=Point(1, -1), end_vector=Point(-1, -1)),
+    ])
+    def test_move(self, motion, batched, mocker):
+        # --given--
+        right_wheel = mocker.Mock(spec=Wheel)
+        left_wheel = mocker.Mock(spec=Wheel)
+        ctrl = MotionController(right_wheel=right_wheel, left_wheel=left_wheel,
+                                configuration={'profile': 'trapezoidal', 'batched': batched})
+        energy_supplier = EnergySupplier(quantity=1000.)
+        profile = ctrl.compute_profile(motion)
+        energy, duration = ctrl.plan_motion(motion)
+        # --when--
+        ctrl.move(motion, energy_supplier)
+        # --then--
+        if batched:
+            right_wheel.run_profile.assert_called_once_with(profile.right)
+        else:
+            assert get_values_from_call_list(right_wheel.run.call_args_list) == list(profile.right)
+            assert get_values_from_call_list(left_wheel.run.call_args_list) == list(profile.left)
+        assert 1000. - energy_supplier.quantity == pytest.approx(energy)
+        assert energy == profile.energy
+        assert duration == profile.duration
+
+
+class TestConcurrentDrive:
+
+    class RecordingWheel(Wheel):
+
+        def __init__(self, barrier=None):
+            self.lengths = []
+            self.threads = set()
+            self.barrier = barrier
+
+        def run(self, length):
+            if self.barrier is not None:
+                # both wheels have to run at the same time to pass
+                self.barrier.wait(timeout=5)
+            self.threads.add(threading.current_thread().name)
+            self.lengths.append(length)
+
+    @pytest.fixture()
+    def ctrl(self):
+        barrier = threading.Barrier(2)
+        ctrl = MotionController(right_wheel=self.RecordingWheel(barrier), left_wheel=self.RecordingWheel(barrier),
+                                configuration={'concurrent': True})
+        yield ctrl
+        ctrl.close()
+
+    def test_wheels_run_concurrently(self, ctrl):
+        # --given--
+        motion = Rotation(start=Point(10, 0), end=Point(0, 10), start_vector=Point(0, 1), end_vector=Point(-1, 0))
+        profile = ctrl.compute_profile(motion)
+        energy_supplier = EnergySupplier()
+        # --when--
+        ctrl.move(motion, energy_supplier)
+        # --then--
+        assert isinstance(ctrl.drive, ConcurrentWheelDrive)
+        assert ctrl.right_wheel.lengths == list(profile.right)
+        assert ctrl.left_wheel.lengths == list(profile.left)
+        assert ctrl.right_wheel.threads == {'right-wheel'}
+        assert ctrl.left_wheel.threads == {'left-wheel'}
+        assert 1000. - energy_supplier.quantity == pytest.approx(profile.energy)
+        # one more step for end of motion
+        assert ctrl.drive.stats.timers['step'][0] == profile.steps + 1
+        assert ctrl.drive.stats.timers['skew'][0] == profile.steps + 1
+
+    def test_wheel_error_is_raised(self, mocker):
+        # --given--
+        ctrl = MotionController(right_wheel=self.RecordingWheel(), left_wheel=self.RecordingWheel(),
+                                configuration={'concurrent': True})
+        mocker.patch.object(ctrl.left_wheel, 'run', side_effect=ValueError('Mocked Exception'))
+        # --when / then--
+        with pytest.raises(ValueError):
+            ctrl.drive.step(1., 1.)
+        ctrl.left_wheel.run.side_effect = None
+        ctrl.drive.step(2., 2.)
+        ctrl.close()
+        assert ctrl.right_wheel.lengths == [1., 2.]
+
+    def test_batched(self, mocker):
+        # --given--
+        right_wheel = mocker.Mock(spec=Wheel)
+        left_wheel = mocker.Mock(spec=Wheel)
+        ctrl = MotionController(right_wheel=right_wheel, left_wheel=left_wheel,
+                                configuration={'concurrent': True, 'batched': True})
+        motion = Translation(Point(0, 0), Point(10, 0))
+        profile = ctrl.compute_profile(motion)
+        # --when--
+        ctrl.move(motion, EnergySupplier())
+        ctrl.close()
+        # --then--
+        right_wheel.run_profile.assert_called_once_with(profile.right)
+        left_wheel.run_profile.assert_called_once_with(profile.left)
+        right_wheel.end_motion.assert_called_once_with()
+        assert not any(worker.is_alive() for worker in ctrl.drive._workers)
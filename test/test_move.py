@@ -1,4 +1,7 @@
 import math
+import pickle
+
+import pytest
 
 from ex02.geometry import Point
 from ex02.motion import Translation, Rotation
@@ -22,4 +25,39 @@ class TestRotation:
 
         rot = Rotation.new_from_translations(prev_, next_)
         assert rot.arc.center == Point(10,5)
-        assert rot.arc.radius == 5
\ No newline at end of file
+        assert rot.arc.radius == 5
+
+    def test_validation_is_opt_in(self):
+        rot = Rotation(Point(-5, 2), Point(1, 0), Point(0, 1), Point(1, -1))
+        with pytest.raises(AssertionError):
+            rot.get_length()
+        with pytest.raises(AssertionError):
+            Rotation(Point(-5, 2), Point(1, 0), Point(0, 1), Point(1, -1), validate=True)
+
+class TestValueTypes:
+
+    def test_translation_is_immutable_and_hashable(self):
+        m = Translation(Point(0, 0), Point(1, 1))
+        with pytest.raises(AttributeError):
+            m.length = 2
+        assert m == Translation(Point(0, 0), Point(1, 1))
+        assert len({m, Translation(Point(0, 0), Point(1, 1))}) == 1
+
+    def test_rotation_is_immutable_and_hashable(self):
+        prev_ = Translation(Point(0, 0), Point(10, 0))
+        next_ = Translation(Point(10, 10), Point(0, 10))
+        rot = Rotation.new_from_translations(prev_, next_)
+        with pytest.raises(AttributeError):
+            rot.arc = None
+        assert rot == Rotation.new_from_translations(prev_, next_)
+        assert hash(rot) == hash(Rotation.new_from_translations(prev_, next_))
+
+    def test_pickle(self):
+        rot = Rotation(Point(10, 0), Point(0, 10), Point(0, 1), Point(-1, 0))
+        tr = Translation(Point(0, 0), Point(1, 1))
+        assert pickle.loads(pickle.dumps([tr, rot])) == [tr, rot]
+
+    def test_rotations_share_cached_arcs(self):
+        a = Rotation(Point(10, 0), Point(0, 10), Point(0, 1), Point(-1, 0))
+        b = Rotation(Point(10, 0), Point(0, 10), Point(0, 1), Point(-1, 0))
+        assert a.arc is b.arc
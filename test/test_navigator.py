@@ -1,7 +1,7 @@
 import pytest
 
-from ex02.geometry import Point
-from ex02.robot import Robot, Arranger, Navigator
+from ex02.geometry import Point, PointArray
+from ex02.robot import Robot, Arranger, CurveArranger, Navigator
 from ex02.motion import Translation
 
 
@@ -58,3 +58,164 @@ class TestNavigator:
         results = nav.arrange_translations(motions)
         # --then--
         optimizer.arrange.assert_called()
+
+    def test_convert_point_array(self, init_controller):
+        # --given--
+        nav, *_ = init_controller
+        positions = [(1, 1), (10, 1), (11, 2)]
+        # --when--
+        points = nav.to_points(PointArray.new(positions))
+        # --then--
+        assert points == [Point.new(xy) for xy in positions]
+
+    def test_iter_translations(self, init_controller, convert_to_points):
+        # --given--
+        nav, *_ = init_controller
+        points = convert_to_points([(0, 0), (1, 1), (3,1), (3,0), (0,0)])
+        # --when--
+        translations = nav.iter_translations(iter(points))
+        # --then--
+        assert list(translations) == nav.to_translations(points)
+
+    @pytest.mark.parametrize('arranger', [Arranger(), CurveArranger()])
+    def test_iter_motions_is_lazy(self, arranger):
+        # --given--
+        nav = Navigator(arranger=arranger)
+        positions = [(0,0), (0,5),(1,8),(3,9),(5,8), (7,5), (6,0),(0,0)]
+        consumed = []
+
+        def source():
+            for xy in positions:
+                consumed.append(xy)
+                yield xy
+        # --when--
+        motions = nav.iter_motions(source())
+        first = next(motions)
+        # --then--
+        assert len(consumed) < len(positions)
+        assert [first] + list(motions) == nav.compute_motions(positions)
+
+    def test_compute_total_distance(self, init_controller):
+        # --given--
+        nav, *_ = init_controller
+        motions = [Translation(Point(0, 0), Point(10, 0)), Translation(Point(10, 0), Point(10, 5))]
+        # --when--
+        distance = nav.compute_total_distance(motions)
+        # --then--
+        assert distance == 15
+
+
+class TestIncrementalPlanning:
+
+    @staticmethod
+    def route(size):
+        pattern = [(0, 0), (1, 5), (3, 7), (5, 5)]
+        return [(x + 10 * k, y) for k in range(size // len(pattern)) for x, y in pattern]
+
+    @pytest.mark.parametrize('arranger', [Arranger(), CurveArranger()])
+    @pytest.mark.parametrize('edit', [
+        lambda r: r[:20] + [(r[20][0], 3)] + r[21:],
+        lambda r: r[:20] + [(r[20][0] + 0.5, 3)] + r[20:],
+        lambda r: r[:20] + r[21:],
+        lambda r: [(-5, 0)] + r,
+        lambda r: r + [(1000, 0)],
+        lambda r: r[:-1],
+        lambda r: r[1:],
+        lambda r: r,
+    ])
+    def test_same_motions_as_full_planning(self, arranger, edit):
+        # --given--
+        positions = self.route(100)
+        nav = Navigator(arranger=arranger)
+        nav.compute_motions(positions)
+        edited = edit(positions)
+        # --when--
+        motions = nav.compute_motions(edited)
+        # --then--
+        expected = Navigator(arranger=arranger).compute_motions(edited)
+        assert [type(m) for m in motions] == [type(m) for m in expected]
+        assert motions == expected
+
+    def test_motions_outside_edit_are_reused(self):
+        # --given--
+        positions = self.route(400)
+        nav = Navigator(arranger=CurveArranger())
+        before = nav.compute_motions(positions)
+        edited = positions[:200] + [(positions[200][0], 3)] + positions[201:]
+        # --when--
+        after = nav.compute_motions(edited)
+        # --then--
+        reused = sum(1 for m in after if any(m is n for n in before))
+        assert len(after) - reused < 10
+        assert after[0] is before[0]
+        assert after[-1] is before[-1]
+        # previous motions are left untouched
+        assert before == Navigator(arranger=CurveArranger()).compute_motions(positions)
+
+    def test_other_arranger_is_fully_planned(self):
+        positions = self.route(20)
+        nav = Navigator(arranger=Arranger())
+        before = nav.compute_motions(positions)
+        nav.arranger = CurveArranger()
+        after = nav.compute_motions(positions)
+        assert after == Navigator(arranger=CurveArranger()).compute_motions(positions)
+        assert after[0] is not before[0]
+
+    def test_full_plan_is_batched(self, mocker):
+        # --given--
+        positions = self.route(400)
+        spy = mocker.spy(Arranger, '_arrange_batch')
+        stepwise = Navigator(arranger=Arranger())
+        mocker.patch.object(stepwise.arranger, 'BATCH_SIZE', None)
+        expected = stepwise.compute_motions(positions)
+        nav = Navigator(arranger=Arranger())
+        # --when--
+        motions = nav.compute_motions(positions)
+        # --then--
+        assert spy.call_count == 1
+        assert motions == expected
+        assert nav.plan.offsets == stepwise.plan.offsets
+        assert nav.plan.skips == stepwise.plan.skips
+
+    def test_overridden_arrange_is_called(self, mocker):
+        # --given--
+        class ReversingArranger(Arranger):
+            def arrange(self, motions):
+                return list(reversed(super().arrange(motions)))
+
+        positions = self.route(20)
+        nav = Navigator(arranger=ReversingArranger())
+        spy = mocker.spy(ReversingArranger, 'arrange')
+        # --when--
+        motions = nav.compute_motions(positions)
+        # --then--
+        assert spy.call_count == 1
+        assert motions == list(reversed(Navigator(arranger=Arranger()).compute_motions(positions)))
+
+
+class TestSimplification:
+
+    @staticmethod
+    def dense_route():
+        # a square, each side sampled with small noise
+        route = []
+        for (x0, y0), (x1, y1) in [((0, 0), (10, 0)), ((10, 0), (10, 10)), ((10, 10), (0, 10)), ((0, 10), (0, 0))]:
+            for i in range(100):
+                noise = 0.001 * (-1) ** i
+                route.append((x0 + (x1 - x0) * i / 100 + noise, y0 + (y1 - y0) * i / 100 + noise))
+        return route + [(0, 0)]
+
+    def test_without_tolerance(self):
+        nav = Navigator(arranger=Arranger())
+        assert len(nav.compute_motions(self.dense_route())) > 400
+
+    def test_compute_motions_with_tolerance(self):
+        nav = Navigator(arranger=Arranger(), tolerance=0.01)
+        motions = nav.compute_motions(self.dense_route())
+        assert len(motions) == 4 + 3
+        assert sum(m.get_length() for m in motions if isinstance(m, Translation)) == pytest.approx(40, abs=0.1)
+
+    def test_iter_motions_with_tolerance(self):
+        nav = Navigator(arranger=Arranger(), tolerance=0.01)
+        motions = list(nav.iter_motions(iter(self.dense_route())))
+        assert len(motions) == 4 + 3
@@ -0,0 +1,94 @@
+import os
+
+import pytest
+
+from ex02.geometry import Point
+from ex02.motion import pack_motions
+from ex02.plancache import PlanCache
+from ex02.robot import Navigator, Arranger, CurveArranger, Robot, Transmitter, MotionController, Wheel, \
+    EnergySupplier
+
+ROUTE = [(0, 0), (1, 5), (3, 7), (5, 5), (10, 5), (11, 10)]
+
+
+class TestPlanCache:
+
+    @pytest.fixture()
+    def motions(self):
+        return Navigator(arranger=CurveArranger()).compute_motions(ROUTE)
+
+    def test_key(self):
+        points = [Point.new(xy) for xy in ROUTE]
+        key = PlanCache.key(points, Arranger(), {'speed': 1}, None)
+        assert key == PlanCache.key(ROUTE, Arranger(), {'speed': 1}, None)
+        assert key != PlanCache.key(points[:-1], Arranger(), {'speed': 1}, None)
+        assert key != PlanCache.key(points, CurveArranger(), {'speed': 1}, None)
+        assert key != PlanCache.key(points, Arranger(), {'speed': 2}, None)
+        assert key != PlanCache.key(points, Arranger(), {'speed': 1}, 0.1)
+
+    def test_put_and_get(self, tmp_path, motions):
+        # --given--
+        cache = PlanCache(tmp_path)
+        # --when--
+        cache.put('a', motions)
+        # --then--
+        assert 'a' in cache
+        assert cache.get('a') == motions
+        assert cache.get('b') is None
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert [name for name in os.listdir(tmp_path)] == ['a' + PlanCache.SUFFIX]
+
+    def test_corrupted_plan(self, tmp_path, motions):
+        cache = PlanCache(tmp_path)
+        cache.put('a', motions)
+        (tmp_path / ('a' + PlanCache.SUFFIX)).write_bytes(b'garbage')
+        assert cache.get('a') is None
+        assert 'a' not in cache
+
+    def test_least_recently_used_plans_are_evicted(self, tmp_path, motions):
+        # --given--
+        size = len(pack_motions(motions))
+        cache = PlanCache(tmp_path, max_bytes=2 * size)
+        cache.put('a', motions)
+        cache.put('b', motions)
+        os.utime(tmp_path / ('a' + PlanCache.SUFFIX), (1, 1))
+        os.utime(tmp_path / ('b' + PlanCache.SUFFIX), (2, 2))
+        cache.get('a')
+        # --when--
+        cache.put('c', motions)
+        # --then--
+        assert len(cache) == 2
+        assert 'a' in cache and 'c' in cache
+        assert 'b' not in cache
+
+    def test_too_large_plan(self, tmp_path, motions):
+        cache = PlanCache(tmp_path, max_bytes=10)
+        cache.put('a', motions)
+        assert len(cache) == 0
+
+
+class TestNavigatorWithPlanCache:
+
+    def test_warm_start(self, tmp_path, mocker):
+        # --given--
+        Navigator(arranger=CurveArranger(), plan_cache=PlanCache(tmp_path)).compute_motions(ROUTE)
+        navigator = Navigator(arranger=CurveArranger(), plan_cache=PlanCache(tmp_path))
+        spy = mocker.spy(navigator, '_replan')
+        # --when--
+        motions = navigator.compute_motions(ROUTE)
+        # --then--
+        spy.assert_not_called()
+        assert motions == Navigator(arranger=CurveArranger()).compute_motions(ROUTE)
+        assert navigator.plan_cache.hits == 1
+
+    def test_configuration_is_part_of_key(self, tmp_path):
+        # --given--
+        cache = PlanCache(tmp_path)
+        for speed in (1, 2):
+            Robot(transmitter=Transmitter(),
+                  motion_controller=MotionController(Wheel(), Wheel(), {'speed': speed}),
+                  navigator=Navigator(arranger=Arranger(), plan_cache=cache),
+                  energy_supplier=EnergySupplier()).load_positions(ROUTE)
+        # --then--
+        assert len(cache) == 2
+        assert cache.hits == 0
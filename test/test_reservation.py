@@ -0,0 +1,110 @@
+import math
+
+import pytest
+
+from ex02.geometry import Point, Segment
+from ex02.motion import Rotation
+from ex02.reservation import ReservationTable, Footprint
+from ex02.robot import MotionController, Wheel, Navigator, Arranger
+
+
+class TestSegment:
+
+    def test_bounding_box(self):
+        assert Segment(Point(3, 0), Point(1, 2)).bounding_box() == (1, 0, 3, 2)
+
+    @pytest.mark.parametrize('other, expected', [
+        (Segment(Point(5, -1), Point(5, 1)), 0),
+        (Segment(Point(0, 2), Point(10, 2)), 2),
+        (Segment(Point(12, 0), Point(15, 0)), 2),
+        (Segment(Point(-3, 4), Point(-3, 4)), 5),
+    ])
+    def test_distance(self, other, expected):
+        segment = Segment(Point(0, 0), Point(10, 0))
+        assert segment.distance(other) == pytest.approx(expected)
+        assert other.distance(segment) == pytest.approx(expected)
+
+
+class TestReservationTable:
+
+    @pytest.fixture()
+    def ctrl(self):
+        return MotionController(right_wheel=Wheel(), left_wheel=Wheel(), configuration={'speed': 1.})
+
+    @staticmethod
+    def plan(positions):
+        return Navigator(arranger=Arranger()).compute_motions(positions)
+
+    def test_crossing_at_same_time(self, ctrl):
+        # -- given --
+        table = ReservationTable()
+        table.add_plan('a', self.plan([(0, 0), (10, 0)]), ctrl)
+        table.add_plan('b', self.plan([(5, -5), (5, 5)]), ctrl)
+        # -- when --
+        conflicts = table.conflicts()
+        # -- then --
+        assert len(conflicts) == 1
+        assert {conflicts[0].first.robot_id, conflicts[0].second.robot_id} == {'a', 'b'}
+        assert conflicts[0].start_time == 0
+        assert conflicts[0].end_time == pytest.approx(10)
+
+    def test_crossing_at_different_times(self, ctrl):
+        table = ReservationTable()
+        table.add_plan('a', self.plan([(0, 0), (10, 0)]), ctrl)
+        table.add_plan('b', self.plan([(5, -5), (5, 5)]), ctrl, start_time=20.)
+        assert table.conflicts() == []
+
+    def test_same_path_one_after_the_other(self, ctrl):
+        table = ReservationTable()
+        table.add_plan('a', self.plan([(0, 0), (10, 0)]), ctrl)
+        table.add_plan('b', self.plan([(0, 0), (10, 0)]), ctrl, start_time=5.)
+        assert table.conflicts() == []
+
+    def test_parallel_lanes(self, ctrl):
+        table = ReservationTable(clearance=0.5)
+        table.add_plan('a', self.plan([(0, 0), (10, 0)]), ctrl)
+        table.add_plan('b', self.plan([(0, 2), (10, 2)]), ctrl)
+        assert table.conflicts() == []
+
+    def test_same_robot_never_conflicts(self, ctrl):
+        table = ReservationTable()
+        table.add_plan('a', self.plan([(0, 0), (10, 0), (0, 0), (10, 0)]), ctrl)
+        assert table.conflicts() == []
+
+    @pytest.mark.parametrize('start_tangent, end_tangent, expected', [
+        (Point(0, 1), Point(-1, 0), (-0.5, -0.5, 10.5, 10.5)),
+        (Point(0, -1), Point(1, 0), (-10.5, -10.5, 10.5, 10.5)),
+    ])
+    def test_rotation_footprint(self, ctrl, start_tangent, end_tangent, expected):
+        rotation = Rotation(Point(10, 0), Point(0, 10), start_tangent, end_tangent)
+        footprint = Footprint.new('a', 0, rotation, 0., 1., clearance=0.5)
+        assert footprint.box == pytest.approx(expected)
+
+    def test_large_radius_rotation_cells(self):
+        # -- given --
+        # arc of radius 1000 and center (0, 1000), turning by 0.01 rad from the origin
+        angle = 0.01
+        end = Point(1000 * math.sin(angle), 1000 * (1 - math.cos(angle)))
+        rotation = Rotation(Point(0, 0), end, Point(1, 0), Point(math.cos(angle), math.sin(angle)))
+        table = ReservationTable(cell_size=5., clearance=0.5)
+        # -- when --
+        table.add(Footprint.new('a', 0, rotation, 0., 1., table.clearance))
+        # -- then --
+        # 4 x 2 cells around the arc, instead of 400 x 400 around its circle
+        assert len(table._cells) == 8
+
+    def test_timing_follows_motion_controller(self, ctrl):
+        table = ReservationTable()
+        end = table.add_plan('a', self.plan([(0, 0), (10, 0), (10, 10)]), ctrl, start_time=5.)
+        assert end == pytest.approx(5. + ctrl.get_duration_for_motions(self.plan([(0, 0), (10, 0), (10, 10)])))
+        assert [f.start_time for f in table.footprints][0] == 5.
+
+    def test_many_robots_on_a_grid(self, ctrl):
+        # robots on distinct rows, one robot on a column crossing all rows,
+        # meeting only the first row robot at (50, 0)
+        table = ReservationTable()
+        for row in range(20):
+            table.add_plan(f'row{row}', self.plan([(0, 10 * row), (100, 10 * row)]), ctrl)
+        table.add_plan('column', self.plan([(50, -50), (50, 200)]), ctrl)
+        conflicts = table.conflicts()
+        assert [{c.first.robot_id, c.second.robot_id} for c in conflicts] == [{'row0', 'column'}]
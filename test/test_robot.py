@@ -72,6 +72,18 @@ class TestRobot:
         # -- then --
         assert len(robot.motions) == 0
 
+    def test_load_positions_checks_planned_energy(self, init_robot):
+        # -- given --
+        robot, transmitter, motion_controller, navigator, energy_supplier = init_robot
+        motions = ['motion']
+        navigator.compute_motions.return_value = motions
+        motion_controller.get_required_energy_for_motions.return_value = 12.
+        # -- when--
+        robot.load_positions([])
+        # -- then --
+        motion_controller.get_required_energy_for_motions.assert_called_once_with(motions)
+        energy_supplier.has_enough.assert_called_once_with(12.)
+
     def test_load_positions_calls(self, init_robot):
         # -- given --
         robot, transmitter, motion_controller, navigator, energy_supplier = init_robot
@@ -106,3 +118,67 @@ class TestRobot:
         # -- then --
         # - get the arguments
         assert motion_controller.move.call_count == 3
+
+    def test_run_gives_energy_supplier(self, mocker, init_robot):
+        # -- given --
+        robot, transmitter, motion_controller, navigator, energy_supplier = init_robot
+        translation = mocker.Mock(spec=Translation)
+        robot.motions = [translation]
+        # -- when--
+        robot.run()
+        # -- then --
+        motion_controller.move.assert_called_once_with(translation, energy_supplier)
+
+    def test_run_with_motion_stream(self, mocker, init_robot):
+        # -- given --
+        robot, transmitter, motion_controller, navigator, energy_supplier = init_robot
+        translation = mocker.Mock(spec=Translation)
+        statuses = []
+        motion_controller.move.side_effect = lambda *_: statuses.append(robot.is_moving())
+        # -- when--
+        robot.run(iter([translation, translation]))
+        # -- then --
+        assert statuses == [True, True]
+        assert not robot.is_moving()
+
+    def test_run_with_empty_motion_stream(self, init_robot):
+        # --given--
+        robot, *_ = init_robot
+        # -- when--
+        with pytest.raises(ValueError):
+            robot.run(iter([]))
+
+    def test_run_positions(self, init_robot):
+        # -- given --
+        robot, transmitter, motion_controller, navigator, energy_supplier = init_robot
+        navigator.iter_motions.return_value = iter(['motion'])
+        motion_controller.plan_motion.return_value = (12., 1.)
+        energy_supplier.has_enough.return_value = True
+        # -- when--
+        robot.run_positions([(0, 0), (1, 0)])
+        # -- then --
+        navigator.iter_motions.assert_called_once_with([(0, 0), (1, 0)])
+        energy_supplier.has_enough.assert_called_once_with(12.)
+        motion_controller.move.assert_called_once_with('motion', energy_supplier)
+
+    def test_run_positions_when_energy_supplier_has_not_enough_energy(self, init_robot):
+        # -- given --
+        robot, transmitter, motion_controller, navigator, energy_supplier = init_robot
+        navigator.iter_motions.return_value = iter(['first', 'second'])
+        motion_controller.plan_motion.return_value = (12., 1.)
+        energy_supplier.has_enough.side_effect = [True, False]
+        # -- when--
+        with pytest.raises(ValueError, match="Not enough energy"):
+            robot.run_positions([(0, 0), (1, 0), (2, 0)])
+        # -- then --
+        motion_controller.move.assert_called_once_with('first', energy_supplier)
+        assert not robot.is_moving()
+
+    def test_exchange_many_through_transmitter(self, init_robot):
+        # -- given --
+        robot, transmitter, *_ = init_robot
+        tcs = [Telecom(command=Command.MOVING)] * 2
+        # -- when --
+        robot.exchange_many(tcs)
+        # -- then --
+        transmitter.exchange_many.assert_called_once_with(tcs)
@@ -0,0 +1,83 @@
+import struct
+
+import pytest
+
+from ex02.geometry import Point, PointArray
+from ex02.robot import Navigator, Arranger, CurveArranger
+from ex02.routefile import RouteFile, save_route
+
+ROUTE = [(0, 0), (1, 5), (3, 7), (5, 5), (10, 5), (11, 10)]
+
+
+def npy(descr, shape, data=b''):
+    header = repr({'descr': descr, 'fortran_order': False, 'shape': shape}).encode('latin1') + b'\n'
+    return b'\x93NUMPY\x01\x00' + struct.pack('<H', len(header)) + header + data
+
+
+class TestRouteFile:
+
+    def test_save_and_open(self, tmp_path):
+        # --given--
+        path = tmp_path / 'route.npy'
+        # --when--
+        size = save_route(path, iter(ROUTE), chunk_size=4)
+        # --then--
+        assert size == len(ROUTE)
+        assert len(path.read_bytes()) % 64 == 16 * len(ROUTE) % 64
+        with RouteFile(path) as route:
+            assert len(route) == len(ROUTE)
+            assert list(route.iter_points()) == [Point.new(xy) for xy in ROUTE]
+            assert [len(chunk) for chunk in route.iter_chunks(4)] == [4, 2]
+            points = route.points
+            assert isinstance(points.coordinates, memoryview)
+            assert points == PointArray.new(ROUTE)
+            del points
+
+    def test_empty_route(self, tmp_path):
+        path = tmp_path / 'route.npy'
+        save_route(path, [])
+        with RouteFile(path) as route:
+            assert len(route) == 0
+            assert list(route) == []
+
+    def test_big_endian_file(self, tmp_path):
+        path = tmp_path / 'route.npy'
+        path.write_bytes(npy('>f8', (2, 2), struct.pack('>4d', 1, 2, 3, 4)))
+        with RouteFile(path) as route:
+            assert route.to_points() == [Point(1, 2), Point(3, 4)]
+
+    @pytest.mark.parametrize('content', [
+        b'',
+        b'not a route',
+        npy('<i4', (2, 2), bytes(16)),
+        npy('<f8', (2, 3), bytes(48)),
+        npy('<f8', (2, 2), bytes(16)),
+        b'\x93NUMPY\x01\x00\x05\x00{foo',
+    ])
+    def test_invalid_file(self, content, tmp_path):
+        path = tmp_path / 'route.npy'
+        path.write_bytes(content)
+        with pytest.raises(ValueError):
+            RouteFile(path)
+
+
+class TestNavigatorOnRouteFile:
+
+    @pytest.mark.parametrize('arranger', [Arranger(), CurveArranger()])
+    def test_plan_from_route_file(self, arranger, tmp_path):
+        # --given--
+        path = tmp_path / 'route.npy'
+        save_route(path, ROUTE)
+        navigator = Navigator(arranger=arranger)
+        RouteFile.CHUNK_SIZE, chunk_size = 2, RouteFile.CHUNK_SIZE
+        try:
+            with RouteFile(path) as route:
+                # --when--
+                streamed = list(navigator.iter_motions(route))
+                computed = navigator.compute_motions(route)
+        finally:
+            RouteFile.CHUNK_SIZE = chunk_size
+        # --then--
+        expected = Navigator(arranger=arranger).compute_motions(ROUTE)
+        assert streamed == expected
+        assert computed == expected
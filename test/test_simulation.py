@@ -0,0 +1,102 @@
+import math
+
+import pytest
+
+from ex02.motion import Translation
+from ex02.geometry import Point
+from ex02.robot import MotionController, Wheel
+from ex02.simulation import EventScheduler, Simulator, SimulatedWheel
+
+SQUARE = [(0, 0), (10, 0), (10, 10), (0, 10), (0, 0)]
+
+
+class TestEventScheduler:
+
+    def test_events_run_in_time_order(self):
+        # -- given --
+        scheduler = EventScheduler()
+        calls = []
+        scheduler.schedule(5, calls.append, 'c')
+        scheduler.schedule(1, calls.append, 'a')
+        scheduler.schedule(1, calls.append, 'b')
+        # -- when --
+        nb_events = scheduler.run(until=3)
+        # -- then --
+        assert nb_events == 2
+        assert calls == ['a', 'b']
+        assert scheduler.clock.now == 3
+        assert len(scheduler) == 1
+        scheduler.run()
+        assert calls == ['a', 'b', 'c']
+        assert scheduler.clock.now == 5
+
+    def test_event_in_the_past(self):
+        with pytest.raises(ValueError):
+            EventScheduler().schedule(-1, print)
+
+
+class TestSimulatedWheel:
+
+    def test_odometer(self):
+        wheel = SimulatedWheel()
+        wheel.run(2)
+        wheel.run_profile([0.1] * 10 + [-1])
+        assert wheel.odometer == pytest.approx(2)
+        assert wheel.distance == pytest.approx(4)
+
+
+class TestSimulator:
+
+    @pytest.mark.parametrize('configuration', [{}, {'profile': 'trapezoidal'}])
+    def test_mission(self, configuration):
+        # -- given --
+        simulator = Simulator(configuration=configuration)
+        robot = simulator.robot
+        robot.load_positions(SQUARE)
+        motions = robot.motions
+        ctrl = MotionController(right_wheel=Wheel(), left_wheel=Wheel(), configuration=configuration)
+        # -- when --
+        report = simulator.run()
+        # -- then --
+        assert report.duration == pytest.approx(ctrl.get_duration_for_motions(motions))
+        assert report.consumed_energy == pytest.approx(ctrl.get_required_energy_for_motions(motions))
+        assert len(report.times) == len(motions) + 1
+        assert (report.xs[-1], report.ys[-1]) == pytest.approx((0, 0))
+        assert report.headings[-1] == pytest.approx(-math.pi / 2)
+        assert list(report.times) == sorted(report.times)
+        assert list(report.energy_levels) == sorted(report.energy_levels, reverse=True)
+        # 3 quarter turns on the spot, by a 1 long wheel axis
+        assert robot.motion_controller.right_wheel.distance == pytest.approx(40 + 3 * math.pi / 4)
+        assert not robot.is_moving()
+
+    def test_wheels_run_once_per_motion(self, mocker):
+        simulator = Simulator()
+        run = mocker.spy(simulator.robot.motion_controller.right_wheel, 'run')
+        simulator.run([Translation(Point(0, 0), Point(10, 0))])
+        assert run.call_count == 1
+        assert simulator.clock.now == pytest.approx(100)
+
+    def test_events_run_while_moving(self):
+        # -- given --
+        simulator = Simulator()
+        seen = []
+        simulator.scheduler.schedule(50, lambda: seen.append((simulator.clock.now, simulator.robot.is_moving())))
+        simulator.scheduler.schedule(500, lambda: seen.append((simulator.clock.now, simulator.robot.is_moving())))
+        # -- when --
+        report = simulator.run_positions([(0, 0), (10, 0)])
+        # -- then --
+        assert seen == [(50, True), (500, False)]
+        assert report.duration == pytest.approx(100)
+        assert report.times[-1] == pytest.approx(100)
+        assert simulator.clock.now == 500
+
+    def test_report_holds_copies(self):
+        # -- given --
+        simulator = Simulator()
+        report = simulator.run_positions([(0, 0), (10, 0)])
+        # -- when --
+        simulator.run_positions([(10, 0), (20, 0)])
+        # -- then --
+        assert len(report.times) == 2
+        assert len(report.energy_levels) == 2
+        assert len(simulator.report().times) == 3
@@ -0,0 +1,105 @@
+import pytest
+
+from ex02.geometry import Point
+from ex02.motion import Translation
+from ex02.robot import Robot, Transmitter, MotionController, Navigator, EnergySupplier, Wheel, Arranger
+from ex02.stats import Stats
+from ex02.telecom import Telecom, Command
+
+
+class TestStats:
+
+    def test_counters(self):
+        stats = Stats()
+        stats.incr('foo')
+        stats.incr('foo', 2)
+        assert stats.snapshot()['counters'] == {'foo': 3}
+
+    def test_timers(self):
+        stats = Stats()
+        stats.add_time('foo', 1.)
+        stats.add_time('foo', 3.)
+        assert stats.snapshot()['timers'] == {'foo': {'count': 2, 'total': 4., 'max': 3., 'mean': 2.}}
+
+    def test_snapshot_is_a_copy(self):
+        stats = Stats()
+        stats.incr('foo')
+        snapshot = stats.snapshot()
+        stats.reset()
+        assert snapshot['counters'] == {'foo': 1}
+        assert stats.snapshot() == {'counters': {}, 'timers': {}}
+
+
+class TestRobotStats:
+
+    @pytest.fixture()
+    def init_robot(self):
+        robot = Robot(transmitter=Transmitter(),
+                      motion_controller=MotionController(right_wheel=Wheel(), left_wheel=Wheel(), configuration={}),
+                      navigator=Navigator(arranger=Arranger()),
+                      energy_supplier=EnergySupplier(quantity=1000.))
+        return robot
+
+    def test_disabled_by_default(self, init_robot):
+        robot = init_robot
+        robot.exchange(Telecom(command=Command.LOADING, payload=[(0, 0), (1, 0), (1, 1)]))
+        assert robot.get_stats() == {}
+        assert robot.exchange(Telecom(command=Command.STATS)).payload == {}
+
+    def test_stats_telecom(self, init_robot):
+        # -- given --
+        robot = init_robot
+        robot.enable_stats()
+        # -- when --
+        robot.exchange(Telecom(command=Command.LOADING, payload=[(0, 0), (1, 0), (1, 1)]))
+        robot.exchange(Telecom(command=Command.MOVE))
+        tm = robot.exchange(Telecom(command=Command.STATS))
+        # -- then --
+        assert tm.command == Command.STATS
+        stats = tm.payload
+        assert stats['navigator']['timers']['planning']['count'] == 1
+        assert stats['navigator']['counters']['planned_motions'] == 3
+        assert stats['motion_controller']['timers']['move.Translation']['count'] == 2
+        assert stats['motion_controller']['timers']['move.Rotation']['count'] == 1
+        assert stats['motion_controller']['counters']['steps'] == 100 + 78 + 100
+        assert stats['transmitter']['timers']['dispatch.LOADING']['count'] == 1
+        assert stats['transmitter']['timers']['dispatch.MOVE']['count'] == 1
+        assert stats['energy_supplier']['counters']['energy'] == pytest.approx(1000. - robot.energy_supplier.quantity)
+
+    def test_stats_telecom_round_trip(self, init_robot):
+        # -- given --
+        robot = init_robot
+        robot.enable_stats()
+        robot.exchange(Telecom(command=Command.LOADING, payload=[(0, 0), (1, 0), (1, 1)]))
+        robot.exchange(Telecom(command=Command.MOVE))
+        # -- when --
+        tm = robot.exchange(Telecom(command=Command.STATS))
+        decoded = Telecom.decode(tm.encode())
+        # -- then --
+        assert decoded.command == Command.STATS
+        assert decoded.payload == tm.payload
+
+    def test_failed_move_is_timed(self, init_robot, mocker):
+        # -- given --
+        ctrl = init_robot.motion_controller
+        ctrl.enable_stats()
+        energy_supplier = EnergySupplier()
+        mocker.patch.object(energy_supplier, 'consume', side_effect=[None, ValueError('empty')])
+        # -- when --
+        with pytest.raises(ValueError):
+            ctrl.move(Translation(Point(0, 0), Point(1, 0)), energy_supplier)
+        # -- then --
+        assert ctrl.stats.timers['move.Translation'][0] == 1
+        assert ctrl.stats.counters['steps'] == 0
+
+    def test_exchange_many_is_timed(self, init_robot):
+        robot = init_robot
+        robot.transmitter.enable_stats()
+        robot.exchange_many([Telecom(command=Command.READY_FOR_LOADING)] * 3)
+        assert robot.get_stats()['transmitter']['timers']['dispatch.READY_FOR_LOADING']['count'] == 3
+
+    def test_disable_stats(self, init_robot):
+        robot = init_robot
+        robot.enable_stats()
+        robot.disable_stats()
+        assert robot.get_stats() == {}
@@ -1,3 +1,6 @@
+import pytest
+
+from ex02.geometry import Point, PointArray
 from ex02.telecom import Telecom, Command
 
 
@@ -8,3 +11,65 @@ class TestNewCommand:
         tc = Telecom(command=Command.READY_FOR_LOADING)
 
 
+class TestWireFormat:
+
+    @pytest.mark.parametrize('command', list(Command))
+    def test_round_trip_without_payload(self, command):
+        tc = Telecom.decode(Telecom(command=command).encode())
+        assert tc.command == command
+        assert tc.payload is None
+        assert tc.errors is None
+
+    def test_round_trip_with_positions(self):
+        positions = [(0, 0), (1.5, -2), (3, 4)]
+        encoded = Telecom(command=Command.LOADING, payload=positions).encode()
+
+        tc = Telecom.decode(encoded)
+
+        assert tc.command == Command.LOADING
+        assert isinstance(tc.payload, PointArray)
+        assert tc.payload.to_points() == [Point.new(xy) for xy in positions]
+
+    def test_payload_is_a_view_on_buffer(self):
+        buffer = bytearray(Telecom(command=Command.LOADING, payload=[(1, 2)]).encode())
+
+        tc = Telecom.decode(buffer)
+        buffer[Telecom.HEADER.size:Telecom.HEADER.size + 8] = bytes(8)
+
+        assert tc.payload[0] == Point(0, 2)
+
+    def test_round_trip_with_errors(self):
+        tc = Telecom.decode(Telecom(command=Command.LOADED_INVALID, errors=['no payload', 'é']).encode())
+        assert tc.command == Command.LOADED_INVALID
+        assert tc.errors == ['no payload', 'é']
+
+    def test_point_array_payload(self):
+        payload = PointArray.new([(1, 2), (3, 4)])
+        tc = Telecom.decode(Telecom(command=Command.LOADING, payload=payload).encode())
+        assert tc.payload == payload
+
+    def test_round_trip_with_document(self):
+        payload = {'navigator': {'counters': {'planned_motions': 3}, 'timers': {}}, 'name': 'é'}
+        tc = Telecom.decode(Telecom(command=Command.STATS, payload=payload, errors=['foo']).encode())
+        assert tc.command == Command.STATS
+        assert tc.payload == payload
+        assert tc.errors == ['foo']
+
+    def test_document_not_serializable(self):
+        with pytest.raises(ValueError):
+            Telecom(command=Command.STATS, payload={'foo': object()}).encode()
+
+    def test_payload_not_positions(self):
+        with pytest.raises(ValueError):
+            Telecom(command=Command.LOADING, payload=['foo']).encode()
+
+    @pytest.mark.parametrize('buffer', [
+        b'',
+        b'\xff\xff' + bytes(8),
+        Telecom(command=Command.LOADING, payload=[(1, 2)]).encode()[:-1],
+        Telecom(command=Command.INVALID, errors=['foo']).encode()[:-1],
+        Telecom(command=Command.STATS, payload={'foo': 1}).encode()[:-1],
+    ])
+    def test_decode_invalid(self, buffer):
+        with pytest.raises(ValueError):
+            Telecom.decode(buffer)
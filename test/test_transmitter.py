@@ -1,5 +1,10 @@
-from ex02.robot import Transmitter
-from ex02.telecom import Telecom, Command
+import asyncio
+import threading
+from enum import Enum
+
+from ex02 import telecom
+from ex02.robot import Transmitter, AsyncTransmitter, handles
+from ex02.telecom import Telecom, Command, Exchanger, register_commands
 import pytest
 from pytest_mock import mocker
 
@@ -94,27 +99,239 @@ class TestTransmitter:
         # then
         assert tm.command == Command.MOVED
 
-class TestFindHandler:
-    class FooRobotComponent(Transmitter):
+class TestExchangeMany:
 
-        def register(self, robot: 'Robot'):
-            self.robot = dict()
+    @pytest.fixture()
+    def init_transmitter(self, mocker):
+        robot = mocker.Mock()
+        robot.is_moving.return_value = False
+        transmitter = Transmitter()
+        transmitter.register(robot)
+        return robot, transmitter
 
-        def _prefix_something(self):
-            pass
+    def test_responses_in_order(self, init_transmitter):
+        # given
+        robot, tr = init_transmitter
+        tcs = [Telecom(command=Command.READY_FOR_LOADING),
+               Telecom(command=Command.LOADING),
+               Telecom(command=Command.LOADING, payload=['foo']),
+               Telecom(command=Command.MOVE)]
+        # when
+        tms = tr.exchange_many(tcs)
+        # then
+        assert [tm.command for tm in tms] == [Command.READY_FOR_LOADING,
+                                              Command.LOADED_INVALID,
+                                              Command.LOADED_OK,
+                                              Command.MOVED]
+
+    def test_robot_state_is_read_for_each_telecom(self, init_transmitter):
+        # given
+        robot, tr = init_transmitter
+        tcs = [Telecom(command=Command.READY_FOR_LOADING)] * 3
+        # when
+        robot.is_moving.side_effect = [False, True, False]
+        tms = tr.exchange_many(tcs)
+        # then
+        assert [tm.command for tm in tms] == [Command.READY_FOR_LOADING,
+                                              Command.MOVING,
+                                              Command.READY_FOR_LOADING]
+        assert robot.is_moving.call_count == 3
+
+    def test_async_exchange_many(self, mocker):
+        # given
+        robot = mocker.Mock()
+        robot.is_moving.return_value = False
+        tr = AsyncTransmitter()
+        tr.register(robot)
+        tcs = [Telecom(command=Command.READY_FOR_LOADING), Telecom(command=Command.MOVE),
+               Telecom(command=Command.READY_FOR_LOADING)]
+
+        async def batch():
+            tms = await tr.exchange_many_async(tcs)
+            await tr.wait_mission()
+            return tms
+
+        # when
+        tms = asyncio.run(batch())
+        # then
+        assert [tm.command for tm in tms] == [Command.READY_FOR_LOADING, Command.MOVING, Command.MOVING]
+
+
+class PluginCommand(Enum):
+    PING = 'ping'
+    PONG = 'pong'
+
+
+class PluginTransmitter(Transmitter):
+
+    @handles(PluginCommand.PING)
+    def ping(self, tc: Telecom) -> Telecom:
+        return Telecom(command=PluginCommand.PONG)
+
+    def _on_MOVE(self, tc: Telecom) -> Telecom:
+        return Telecom(command=Command.INVALID)
+
+
+class TestHandlerRegistry:
+
+    @pytest.fixture()
+    def plugin_commands(self, request):
+        commands, codes = list(telecom._COMMANDS), dict(telecom._COMMAND_CODES)
+
+        def unregister():
+            telecom._COMMANDS[:] = commands
+            telecom._COMMAND_CODES.clear()
+            telecom._COMMAND_CODES.update(codes)
+
+        request.addfinalizer(unregister)
+        register_commands(PluginCommand)
+        return PluginCommand
 
-        def _prefix_something_else(self):
+    def test_handlers_are_collected_by_class(self):
+        assert set(Transmitter._handlers) == {Command.READY_FOR_LOADING, Command.LOADING,
+                                              Command.MOVE, Command.STATS}
+        assert Transmitter._handlers[Command.MOVE] is Transmitter._on_MOVE
+        assert Transmitter()._handlers is Transmitter()._handlers
+
+    def test_subclass_handlers(self, mocker):
+        # -- given --
+        transmitter = PluginTransmitter()
+        transmitter.register(mocker.Mock())
+        # -- when --
+        responses = transmitter.exchange_many([Telecom(command=PluginCommand.PING),
+                                               Telecom(command=Command.MOVE)])
+        # -- then --
+        assert [r.command for r in responses] == [PluginCommand.PONG, Command.INVALID]
+        assert Transmitter._handlers[Command.MOVE] is Transmitter._on_MOVE
+        assert PluginCommand.PING not in Transmitter._handlers
+
+    def test_register_handler(self, mocker):
+        # -- given --
+        class Transmitter2(Transmitter):
             pass
+        Transmitter2.register_handler(PluginCommand.PONG, lambda transmitter, tc: tc)
+        transmitter = Transmitter2()
+        transmitter.register(mocker.Mock())
+        tc = Telecom(command=PluginCommand.PONG)
+        # -- when / then --
+        assert transmitter.exchange(tc) is tc
+        assert PluginCommand.PONG not in Transmitter._handlers
 
-    def test_find_handlers_for_suffix(self):
+    def test_registered_handler_is_inherited(self, mocker):
         # -- given --
-        foo = TestFindHandler.FooRobotComponent()
+        class Transmitter2(Transmitter):
+            pass
+
+        class Transmitter3(Transmitter2):
+            pass
+        Transmitter2.register_handler(PluginCommand.PONG, lambda transmitter, tc: tc)
+
         # -- when --
-        results = Transmitter._find_handlers_for_suffix(foo, '_prefix_')
+        class Transmitter4(Transmitter2):
+            pass
         # -- then --
-        # keys are function postfix
-        assert [t for t in results.keys()] == ['something', 'something_else']
-        # values are functions
-        assert any(callable(f) for f in results.values())
-        # and names are the real names
-        assert any(f.__name__.startswith('_prefix_') for f in results.values())
+        for klass in (Transmitter2, Transmitter3, Transmitter4):
+            transmitter = klass()
+            transmitter.register(mocker.Mock())
+            tc = Telecom(command=PluginCommand.PONG)
+            assert transmitter.exchange(tc) is tc
+        assert PluginCommand.PONG not in Transmitter._handlers
+        assert PluginCommand.PONG not in AsyncTransmitter._handlers
+
+    def test_plugin_commands_not_registered(self):
+        with pytest.raises(ValueError):
+            Telecom(command=PluginCommand.PING).encode()
+
+    def test_plugin_commands_on_the_wire(self, plugin_commands):
+        tc = Telecom(command=PluginCommand.PING)
+        assert Telecom.decode(tc.encode()).command is PluginCommand.PING
+        assert Telecom.decode(Telecom(command=Command.STATS).encode()).command is Command.STATS
+
+
+class TestAsyncTransmitter:
+
+    @pytest.fixture()
+    def init_transmitter(self, mocker):
+        robot = mocker.Mock()
+        robot.is_moving.return_value = False
+        transmitter = AsyncTransmitter()
+        transmitter.register(robot)
+        return robot, transmitter
+
+    def test_send_tc_ready_for_loading(self, init_transmitter):
+        # given
+        robot, tr = init_transmitter
+        # when
+        tm = asyncio.run(tr.exchange_async(Telecom(command=Command.READY_FOR_LOADING)))
+        # then
+        assert tm.command == Command.READY_FOR_LOADING
+
+    def test_telecoms_are_answered_while_moving(self, init_transmitter):
+        # given
+        robot, tr = init_transmitter
+        release = threading.Event()
+        robot.run.side_effect = lambda: release.wait(5)
+
+        async def mission():
+            started = await tr.exchange_async(Telecom(command=Command.MOVE))
+            ready = await tr.exchange_async(Telecom(command=Command.READY_FOR_LOADING))
+            loading = await tr.exchange_async(Telecom(command=Command.LOADING, payload=['foo']))
+            again = await tr.exchange_async(Telecom(command=Command.MOVE))
+            release.set()
+            moved = await tr.wait_mission()
+            return started, ready, loading, again, moved
+
+        # when
+        started, ready, loading, again, moved = asyncio.run(mission())
+        # then
+        assert started.command == Command.MOVING
+        assert ready.command == Command.MOVING
+        assert loading.command == Command.MOVING
+        assert again.command == Command.MOVING
+        assert moved.command == Command.MOVED
+        robot.run.assert_called_once()
+        robot.load_positions.assert_not_called()
+
+    def test_mission_error(self, init_transmitter):
+        # given
+        robot, tr = init_transmitter
+        robot.run.side_effect = ValueError("Mocked Exception")
+
+        async def mission():
+            await tr.exchange_async(Telecom(command=Command.MOVE))
+            return await tr.wait_mission()
+
+        # when
+        tm = asyncio.run(mission())
+        # then
+        assert tm.command == Command.INVALID
+
+    def test_loading_runs_in_executor(self, init_transmitter):
+        # given
+        robot, tr = init_transmitter
+        threads = []
+        robot.load_positions.side_effect = lambda positions: threads.append(threading.get_ident())
+
+        async def loading():
+            return await tr.exchange_async(Telecom(command=Command.LOADING, payload=[(0, 0), (1, 0)]))
+
+        # when
+        tm = asyncio.run(loading())
+        # then
+        assert tm.command == Command.LOADED_OK
+        assert threads and threads[0] != threading.get_ident()
+
+    def test_exchange_is_blocking(self, init_transmitter):
+        # given
+        robot, tr = init_transmitter
+        # when
+        tm = tr.exchange(Telecom(command=Command.MOVE))
+        # then
+        assert isinstance(tr, Exchanger)
+        assert tm.command == Command.MOVED
+        robot.run.assert_called_once()
+
+    def test_wait_without_mission(self, init_transmitter):
+        robot, tr = init_transmitter
+        with pytest.raises(ValueError):
+            asyncio.run(tr.wait_mission())